@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Memoised answers, keyed by everything they depend on.
+
+Each entry holds one result and the time it took to compute: a Python answer
+per (day, part), or the output rows of a whole solution.sql. Its key is the
+implementation, day and part plus the sha256 of the input and of the solver
+source. For SQL the input hash is the one the database recorded in
+input_manifest when it loaded the input (not the file on disk), plus the load
+format version. Editing a solver or an input just misses, so only the days
+that changed are recomputed. Entries live in one JSON file bounded to
+max_entries, evicting the least recently used.
+
+Used by run_python.py --cached and run_sql.py --cached.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import generate_data_sql
+import parse_cache
+import solvers
+
+DEFAULT_PATH = os.path.join(solvers.ROOT, ".answer_cache.json")
+DEFAULT_MAX_ENTRIES = 256
+
+class AnswerCache:
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, key):
+        """The entry for key ({"value", "seconds", ...}), or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry["last_used"] = time.time()
+        return entry
+
+    def put(self, key, value, seconds):
+        self.entries[key] = {"value": value, "seconds": seconds, "last_used": time.time()}
+
+    def save(self):
+        """Evict down to max_entries, least recently used first, and write."""
+        if len(self.entries) > self.max_entries:
+            recent = sorted(self.entries.items(), key=lambda item: item[1]["last_used"],
+                            reverse=True)
+            self.entries = dict(recent[:self.max_entries])
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.entries, f, indent=1)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+def python_key(day, part, source_sha, input_sha):
+    return f"python:{day}:{part}:{input_sha}:{source_sha}"
+
+def sql_key(day, sql_path, input_sha):
+    """Key for a solution.sql run; input_sha is the hash loaded in the database."""
+    source_sha = parse_cache.content_hash(sql_path)
+    return f"sql:{day}:all:{input_sha}:{source_sha}:v{generate_data_sql.SQL_FORMAT_VERSION}"
+
+def solve_day_cached(day, cache, path=None):
+    """solvers.solve_day, serving solver calls whose parts are all cached.
+
+    Returns (answers, seconds, cached_parts); seconds adds up the recorded
+    times of cached calls and the measured times of the rest.
+    """
+    path = path or solvers.input_path(day)
+    input_sha = parse_cache.content_hash(path)
+    answers = {}
+    seconds = 0.0
+    cached_parts = set()
+
+    for filename, function, parts in solvers.solver_calls(day):
+        source_sha = parse_cache.content_hash(os.path.join(solvers.day_dir(day), filename))
+        keys = {part: python_key(day, part, source_sha, input_sha) for part, _ in parts}
+        entries = [cache.get(key) for key in keys.values()]
+        if all(entries):
+            for (part, _), entry in zip(parts, entries):
+                answers[part] = entry["value"]
+                cached_parts.add(part)
+            seconds += entries[0]["seconds"]
+            continue
+
+        start = time.perf_counter()
+        result = getattr(solvers.load_module(day, filename), function)(path)
+        elapsed = time.perf_counter() - start
+        seconds += elapsed
+        for part, index in parts:
+            answers[part] = result if index is None else result[index]
+            cache.put(keys[part], answers[part], elapsed)
+
+    return answers, seconds, cached_parts
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Solve many inputs for one day in a single pool of warm worker processes.
+
+Inputs come from a directory (every file in it) or a manifest (one path per
+line, relative to the manifest; blank lines and # comments are skipped).
+Each worker imports the day's solvers once and keeps them, along with any
+static structures they memoise (e.g. day 12's shape catalogues), for every
+input it is handed. With --no-parse-cache the inputs are parsed directly
+rather than through parse_cache.py, so a large batch of one-off inputs does
+not churn the cache. One JSON line is written per input as it finishes:
+
+    {"day": 8, "input": "...", "answers": {"1": ..., "2": ...}, "seconds": ..., "error": null}
+
+Usage:
+    python3 batch.py 8 inputs/                      # JSON lines on stdout
+    python3 batch.py 12 --manifest inputs.txt --workers 16 -o results.jsonl
+    python3 batch.py 9 generated/ --no-parse-cache
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+import parse_cache
+import solvers
+
+def read_manifest(manifest_path):
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    paths = []
+    with open(manifest_path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                paths.append(os.path.join(base, line))
+    return paths
+
+def list_directory(directory):
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if os.path.isfile(os.path.join(directory, name))]
+
+_worker_day = None
+
+def _init_worker(day):
+    global _worker_day
+    _worker_day = day
+    for filename, _, _ in solvers.solver_calls(day):
+        solvers.load_module(day, filename)
+
+def solve_one(path):
+    """Solve one input for the worker's day; returns its result dict."""
+    start = time.perf_counter()
+    try:
+        answers = solvers.solve_day(_worker_day, path, solvers.IN_PROCESS_OPTIONS.get(_worker_day))
+        error = None
+    except Exception:
+        answers = {}
+        error = traceback.format_exc().strip().splitlines()[-1]
+    return {
+        "day": _worker_day,
+        "input": path,
+        "answers": {str(part): answer for part, answer in sorted(answers.items())},
+        "seconds": time.perf_counter() - start,
+        "error": error,
+    }
+
+def run_batch(day, paths, workers=None, chunk_size=1, on_result=None):
+    """Solve every path for day, over workers processes (1: in this process).
+
+    on_result(result) is called as each input finishes, in completion order.
+    Returns the number of inputs that failed.
+    """
+    workers = workers or os.cpu_count() or 1
+    failures = 0
+
+    def record(result):
+        nonlocal failures
+        failures += result["error"] is not None
+        if on_result is not None:
+            on_result(result)
+
+    if workers == 1:
+        _init_worker(day)
+        for path in paths:
+            record(solve_one(path))
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(day,)) as pool:
+            for result in pool.imap_unordered(solve_one, paths, chunksize=chunk_size):
+                record(result)
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('day', type=int, choices=sorted(solvers.SOLVERS))
+    parser.add_argument('directory', nargs='?', help="solve every file in this directory")
+    parser.add_argument('--manifest', help="file listing the inputs, one per line")
+    parser.add_argument('--workers', type=int, help="worker processes (default: every core)")
+    parser.add_argument('--chunk-size', type=int, default=1,
+                        help="inputs handed to a worker at a time (default 1)")
+    parser.add_argument('-o', '--output', help="JSON lines file (default: stdout)")
+    parser.add_argument('--no-parse-cache', action='store_true',
+                        help="parse every input directly, bypassing the parse cache")
+    args = parser.parse_args()
+
+    if bool(args.directory) == bool(args.manifest):
+        parser.error("give either a directory or --manifest")
+    paths = read_manifest(args.manifest) if args.manifest else list_directory(args.directory)
+    if args.no_parse_cache:
+        parse_cache.disable()  # before the pool starts, so workers inherit it
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        def write(result):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+        failures = run_batch(args.day, paths, args.workers, args.chunk_size, on_result=write)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"Solved {len(paths)} inputs for day {args.day} in "
+          f"{time.perf_counter() - start:.2f}s ({failures} failed)", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
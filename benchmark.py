@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Python solvers over a ladder of synthetic input sizes.
+
+For each day, inputs from synthetic.py are generated at several multiples of
+the puzzle input's size. Each size is solved --warmup times untimed, then
+--repeat times timed, and once more under tracemalloc for peak memory. The
+median and p95 times, the peak, and the fitted complexity exponent (the slope
+of log time against log n) are printed and can be saved as a JSON baseline;
+later runs are compared against it and regressions beyond --tolerance make
+the exit status 1.
+
+Every solve runs in this process (day 12 without its pool, see
+solvers.IN_PROCESS_OPTIONS), so the numbers do not depend on the core count,
+and with the parse cache off, so every run parses its input.
+
+Usage:
+    python3 benchmark.py --save                  # record benchmark_baseline.json
+    python3 benchmark.py --days 8 9              # compare against it
+    python3 benchmark.py --factors 0.5 1 2 4 --repeat 9
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import parse_cache
+import solvers
+import synthetic
+
+DEFAULT_BASELINE = os.path.join(solvers.ROOT, "benchmark_baseline.json")
+DEFAULT_FACTORS = (0.25, 0.5, 1, 2)
+
+def ladder(day, factors):
+    """Input sizes for a day: factors times the puzzle input's size."""
+    base = synthetic.SCALE[day][1]
+    return sorted({max(1, round(base * f)) for f in factors})
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of values."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def peak_memory(day, path):
+    """Peak traced allocation, in bytes, of one solve."""
+    tracemalloc.start()
+    try:
+        solvers.solve_day(day, path, solvers.IN_PROCESS_OPTIONS.get(day))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def measure(day, path, repeat=5, warmup=1):
+    """Time repeat solves of path after warmup untimed ones."""
+    options = solvers.IN_PROCESS_OPTIONS.get(day)
+    for _ in range(warmup):
+        solvers.solve_day(day, path, options)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solvers.solve_day(day, path, options)
+        times.append(time.perf_counter() - start)
+    return {
+        "median": statistics.median(times),
+        "p95": percentile(times, 95),
+        "min": min(times),
+        "peak_bytes": peak_memory(day, path),
+    }
+
+def fit_exponent(points):
+    """Least-squares slope of log(seconds) against log(n), or None."""
+    points = [(math.log(n), math.log(t)) for n, t in points if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if var == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+def bench_day(day, factors=DEFAULT_FACTORS, repeat=5, warmup=1, seed=0, workdir=None):
+    """Run the ladder for one day; returns its results dict."""
+    runs = []
+    for n in ladder(day, factors):
+        path = os.path.join(workdir, f"day{day}-{n}")
+        synthetic.write_input(path, day, n, seed)
+        run = {"n": n, **measure(day, path, repeat, warmup)}
+        runs.append(run)
+        print(f"  day {day:>2}  n={n:<8} median {run['median']:.4f}s  "
+              f"p95 {run['p95']:.4f}s  peak {run['peak_bytes'] / 2 ** 20:.1f} MiB",
+              file=sys.stderr)
+    return {
+        "unit": synthetic.SCALE[day][0],
+        "exponent": fit_exponent([(r["n"], r["median"]) for r in runs]),
+        "runs": runs,
+    }
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+def regressions(current, baseline, tolerance, min_delta=0.005):
+    """Compare results to a baseline; returns a list of problem strings.
+
+    Only sizes present in both are compared; a median or peak more than
+    tolerance (a fraction) above the baseline is a regression. Time changes
+    under min_delta seconds are timer noise and never flagged.
+    """
+    problems = []
+    for day, result in current["days"].items():
+        base_runs = {r["n"]: r for r in baseline.get("days", {}).get(day, {}).get("runs", [])}
+        for run in result["runs"]:
+            base = base_runs.get(run["n"])
+            if base is None:
+                continue
+            for key, label in (("median", "time"), ("peak_bytes", "peak memory")):
+                if key == "median" and run[key] - base[key] < min_delta:
+                    continue
+                if base[key] > 0 and run[key] > base[key] * (1 + tolerance):
+                    problems.append(f"day {day} n={run['n']}: {label} "
+                                    f"{run[key] / base[key]:.2f}x baseline")
+    return problems
+
+def print_report(current, baseline=None):
+    print(f"{'Day':>4}  {'n':>8}  {'Median s':>10}  {'p95 s':>10}  {'Peak MiB':>9}  "
+          f"{'vs base':>8}  Exponent")
+    for day, result in current["days"].items():
+        base_runs = {}
+        if baseline:
+            base_runs = {r["n"]: r for r in baseline.get("days", {}).get(day, {}).get("runs", [])}
+        exponent = result["exponent"]
+        for i, run in enumerate(result["runs"]):
+            base = base_runs.get(run["n"])
+            ratio = f"{run['median'] / base['median']:.2f}x" if base and base["median"] else ""
+            exp = f"{exponent:.2f}" if i == 0 and exponent is not None else ""
+            print(f"{day:>4}  {run['n']:>8}  {run['median']:>10.4f}  {run['p95']:>10.4f}  "
+                  f"{run['peak_bytes'] / 2 ** 20:>9.1f}  {ratio:>8}  {exp}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--days', type=int, nargs='+', help="only benchmark these days")
+    parser.add_argument('--factors', type=float, nargs='+', default=list(DEFAULT_FACTORS),
+                        help="input sizes as multiples of the puzzle input (default %(default)s)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per size")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs per size")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic input seed")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save', action='store_true', help="write results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown before flagging a regression (default 0.25)")
+    parser.add_argument('--min-delta', type=float, default=0.005,
+                        help="ignore time changes below this many seconds (default 0.005)")
+    args = parser.parse_args()
+
+    parse_cache.disable()
+    days = args.days or solvers.available_days()
+    current = {"environment": environment(), "seed": args.seed, "days": {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        for day in days:
+            current["days"][str(day)] = bench_day(day, args.factors, args.repeat,
+                                                  args.warmup, args.seed, workdir)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(current, baseline)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+    elif baseline:
+        problems = regressions(current, baseline, args.tolerance, args.min_delta)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Differential check: run the Python and SQL solution of each day on the same
+input, check that the answers agree, and compare their speed.
+
+The SQL side runs against whatever is loaded in Postgres; before trusting it,
+the input hash recorded in input_manifest is checked against day-N/input.
+Any mismatch (answers or input) is reported and makes the exit status 1.
+
+Usage:
+    python3 compare.py                       # all days, docker container
+    python3 compare.py --days 1 4 --dsn postgresql://localhost/aoc
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+import generate_data_sql
+import run_sql
+import solvers
+
+def sql_answers(rows):
+    """Map 'Part N' result rows to {N: answer}."""
+    answers = {}
+    for row in rows:
+        match = re.search(r'Part (\d+)', row[0]) if row else None
+        if match and len(row) > 1:
+            answers[int(match.group(1))] = row[1]
+    return answers
+
+def compare_day(day, dsn=None, loaded=None):
+    """Run both implementations of a day; returns a comparison dict."""
+    path = solvers.input_path(day)
+
+    start = time.perf_counter()
+    py_answers = solvers.solve_day(day, path)
+    py_seconds = time.perf_counter() - start
+
+    problems = []
+    sql_path = os.path.join(solvers.day_dir(day), "solution.sql")
+    if not os.path.exists(sql_path):
+        return {"day": day, "python": py_answers, "sql": {}, "py_seconds": py_seconds,
+                "sql_seconds": None, "problems": ["no solution.sql"]}
+
+    if loaded is not None and loaded.get(day) != generate_data_sql.input_hash(path):
+        problems.append("database input differs from day-N/input (run generate_data_sql.py "
+                        "and reload)")
+
+    result = run_sql.run_day(day, sql_path, dsn)
+    if not result["ok"]:
+        problems.append("SQL failed: " + result["error"].splitlines()[-1]
+                        if result["error"] else "SQL failed")
+    sql = sql_answers(result["rows"])
+
+    for part in sorted(set(py_answers) | set(sql)):
+        if str(py_answers.get(part)) != str(sql.get(part)):
+            problems.append(f"part {part}: python {py_answers.get(part)} != sql {sql.get(part)}")
+
+    return {"day": day, "python": py_answers, "sql": sql, "py_seconds": py_seconds,
+            "sql_seconds": result["seconds"] if result["ok"] else None, "problems": problems}
+
+def print_report(comparisons):
+    print(f"{'Day':>4}  {'Part':>4}  {'Python':>18}  {'SQL':>18}  "
+          f"{'Py s':>8}  {'SQL s':>8}  {'SQL/Py':>7}  Status")
+    for c in comparisons:
+        ratio = ""
+        if c["sql_seconds"] is not None and c["py_seconds"] > 0:
+            ratio = f"{c['sql_seconds'] / c['py_seconds']:.2f}"
+        sql_s = "" if c["sql_seconds"] is None else f"{c['sql_seconds']:.3f}"
+        status = "ok" if not c["problems"] else "MISMATCH"
+        for i, part in enumerate(sorted(set(c["python"]) | set(c["sql"]))):
+            times = (f"{c['py_seconds']:>8.3f}  {sql_s:>8}  {ratio:>7}" if i == 0
+                     else " " * 29)
+            print(f"{c['day']:>4}  {part:>4}  {str(c['python'].get(part, '')):>18}  "
+                  f"{str(c['sql'].get(part, '')):>18}  {times}  {status}")
+    for c in comparisons:
+        for problem in c["problems"]:
+            print(f"Day {c['day']}: {problem}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dsn', help="Postgres connection string for psql "
+                                      "(default: the aoc_postgres docker container)")
+    parser.add_argument('--days', type=int, nargs='+', help="only compare these days")
+    args = parser.parse_args()
+
+    days = args.days or solvers.available_days()
+    loaded = run_sql.loaded_hashes(args.dsn)
+    if not loaded:
+        sys.exit("cannot read input_manifest (is psql installed and the database loaded?)")
+    comparisons = [compare_day(day, args.dsn, loaded) for day in days]
+    print_report(comparisons)
+
+    if any(c["problems"] for c in comparisons):
+        print("MISMATCH: Python and SQL disagree", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
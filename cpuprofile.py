@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Where each day spends its time, under cProfile or a sampling profiler.
+
+A day's solvers run in this process (day 12 without its pool, so the
+packing search is visible) under one of two profilers:
+
+  cprofile  deterministic, exact call counts, slows call-heavy code down
+  sample    SIGPROF every --interval seconds of CPU time records the Python
+            stack; low overhead, counts are samples rather than calls
+
+Either way profiles/day-N.pstats (for pstats, snakeviz, ...) and
+profiles/day-N.collapsed (one "outer;...;inner weight" line per stack, for
+flamegraph.pl, speedscope, inferno) are written, and the top functions by
+cumulative time are printed. cProfile records only caller/callee pairs, so
+its collapsed stacks split each function's time across its callers in
+proportion, as flameprof does; sampled stacks are exact.
+
+Usage:
+    python3 run_python.py --days 9 --profile     # the usual way in
+    python3 cpuprofile.py --days 12 --mode sample --top 15
+    python3 cpuprofile.py --days 10 --n 40 --out /tmp/profiles
+"""
+
+import argparse
+import cProfile
+import collections
+import os
+import pstats
+import signal
+import sys
+import tempfile
+import time
+
+import solvers
+import synthetic
+
+MODES = ("cprofile", "sample")
+DEFAULT_DIR = os.path.join(solvers.ROOT, "profiles")
+
+def _func_key(code):
+    """pstats' (filename, line, name) key for a code object."""
+    return (code.co_filename, code.co_firstlineno, code.co_name)
+
+class SampleProfiler:
+    """Counts Python stacks seen by a SIGPROF timer (main thread, Unix only).
+
+    stacks maps a tuple of function keys, outermost first, to its samples.
+    Frames above the one that called start() are left out. The kernel may
+    deliver fewer signals than asked for, so samples are weighted by the CPU
+    time actually used rather than by interval.
+    """
+
+    def __init__(self, interval=0.001):
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("sampling needs signal.setitimer (Unix)")
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.cpu_seconds = 0.0
+        self._base = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None and frame is not self._base:
+            stack.append(_func_key(frame.f_code))
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def start(self):
+        self._base = sys._getframe(1)
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        self._cpu_start = time.process_time()
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        self.cpu_seconds += time.process_time() - self._cpu_start
+        signal.signal(signal.SIGPROF, self._previous)
+
+    def runcall(self, func, *args, **kwargs):
+        self.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.stop()
+
+    def create_stats(self):
+        """Fill self.stats in cProfile's layout so pstats.Stats accepts us.
+
+        Each sample is worth an equal share of the CPU time; call counts are
+        sample counts, and a function (or caller/callee pair) counts once per
+        sample however deeply it recurses.
+        """
+        stats = {}
+        per_sample = self.cpu_seconds / max(sum(self.stacks.values()), 1)
+        for stack, count in self.stacks.items():
+            seconds = count * per_sample
+            leaf = stack[-1]
+            for func in set(stack):
+                cc, nc, tt, ct, callers = stats.get(func, (0, 0, 0.0, 0.0, {}))
+                stats[func] = (cc + count, nc + count, tt + (seconds if func == leaf else 0.0),
+                               ct + seconds, callers)
+            for caller, callee in set(zip(stack, stack[1:])):
+                callers = stats[callee][4]
+                cc, nc, tt, ct = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (cc + count, nc + count,
+                                   tt + (seconds if callee == leaf else 0.0), ct + seconds)
+        self.stats = stats
+
+def _label(func):
+    filename, line, name = func
+    if filename == "~":  # built-ins, as cProfile names them
+        return name
+    if os.path.isabs(filename) and filename.startswith(solvers.ROOT):
+        filename = os.path.relpath(filename, solvers.ROOT)
+    return f"{name} ({filename}:{line})"
+
+def collapsed_from_samples(stacks):
+    """Collapsed-stack lines, weighted by sample count."""
+    return [f"{';'.join(_label(func) for func in stack)} {count}"
+            for stack, count in sorted(stacks.items())]
+
+def collapsed_from_stats(stats, min_fraction=1e-4, max_depth=200):
+    """Collapsed-stack lines from cProfile's caller graph, weighted in microseconds.
+
+    Walks down from the functions nobody called, giving each callee the share
+    of its time that the current caller accounts for. Recursive edges and
+    paths below min_fraction of the total are dropped.
+    """
+    callees = collections.defaultdict(list)
+    for func, (_, _, _, ct, callers) in stats.items():
+        for caller, (_, _, _, edge_ct) in callers.items():
+            callees[caller].append((func, edge_ct))
+    roots = [func for func, entry in stats.items() if not entry[4]]
+    total = sum(stats[func][3] for func in roots) or 1.0
+    weights = collections.Counter()
+
+    def walk(func, path, seconds):
+        tt, ct = stats[func][2], stats[func][3]
+        share = seconds / ct if ct else 0.0
+        weights[path] += tt * share
+        if len(path) >= max_depth:
+            return
+        for callee, edge_ct in callees[func]:
+            callee_seconds = edge_ct * share
+            if callee in path or callee_seconds < min_fraction * total:
+                continue
+            walk(callee, path + (callee,), callee_seconds)
+
+    for root in roots:
+        walk(root, (root,), stats[root][3])
+    return [f"{';'.join(_label(func) for func in path)} {round(seconds * 1e6)}"
+            for path, seconds in sorted(weights.items()) if round(seconds * 1e6) > 0]
+
+def profile_day(day, path=None, mode="cprofile", out_dir=DEFAULT_DIR, interval=0.001):
+    """Solve a day under the chosen profiler and write its profile files.
+
+    Returns (answers, seconds, pstats.Stats, [written paths]).
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown profiler {mode!r}; choose from {', '.join(MODES)}")
+    for filename, _, _ in solvers.solver_calls(day):
+        solvers.load_module(day, filename)  # keep imports out of the profile
+
+    profiler = cProfile.Profile() if mode == "cprofile" else SampleProfiler(interval)
+    start = time.perf_counter()
+    answers = profiler.runcall(solvers.solve_day, day, path, solvers.IN_PROCESS_OPTIONS.get(day))
+    seconds = time.perf_counter() - start
+
+    stats = pstats.Stats(profiler)
+    if mode == "cprofile":
+        collapsed = collapsed_from_stats(stats.stats)
+    else:
+        collapsed = collapsed_from_samples(profiler.stacks)
+
+    os.makedirs(out_dir, exist_ok=True)
+    pstats_path = os.path.join(out_dir, f"day-{day}.pstats")
+    collapsed_path = os.path.join(out_dir, f"day-{day}.collapsed")
+    stats.dump_stats(pstats_path)
+    with open(collapsed_path, 'w') as f:
+        f.writelines(line + "\n" for line in collapsed)
+    return answers, seconds, stats, [pstats_path, collapsed_path]
+
+def print_top(stats, top=20):
+    """Print the top functions by cumulative time."""
+    stats.sort_stats("cumulative").print_stats(top)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--days', type=int, nargs='+', help="only profile these days")
+    parser.add_argument('--mode', choices=MODES, default="cprofile",
+                        help="profiler to use (default %(default)s)")
+    parser.add_argument('--n', type=int, help="profile a synthetic input of this size "
+                                              "instead of day-N/input")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic input seed")
+    parser.add_argument('--top', type=int, default=20, help="functions to print per day")
+    parser.add_argument('--interval', type=float, default=0.001,
+                        help="sampling interval in CPU seconds (default 0.001)")
+    parser.add_argument('--out', default=DEFAULT_DIR, help="directory for the profile files")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for day in args.days or solvers.available_days():
+            path = None
+            if args.n is not None:
+                path = synthetic.write_input(os.path.join(workdir, f"day{day}"), day,
+                                             args.n, args.seed)
+            answers, seconds, stats, written = profile_day(day, path, args.mode, args.out,
+                                                           args.interval)
+            print(f"--- Day {day} ({seconds:.2f}s under {args.mode}) ---")
+            for part, answer in sorted(answers.items()):
+                print(f"  Part {part}: {answer}")
+            print_top(stats, args.top)
+            print(f"  Wrote {', '.join(written)}")
+            sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
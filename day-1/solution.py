@@ -1,3 +1,7 @@
+import os
+from array import array
+
+
 def solve(input_path):
     with open(input_path) as f:
         rotations = [line.strip() for line in f if line.strip()]
@@ -59,8 +63,316 @@ def solve_part2(input_path):
     return zero_count
 
 
+# The dial as a monoid: a block of rotations is summarised by a transfer
+# table (offset, landings, crossings), where for each start position p the
+# block ends at (p + offset) % 100, lands on 0 landings[p] times and passes
+# through 0 crossings[p] times. Tables compose associatively, so blocks can be
+# summarised independently and folded together in order.
+DIAL_SIZE = 100
+IDENTITY = (0, (0,) * DIAL_SIZE, (0,) * DIAL_SIZE)
+
+
+def _add_cyclic(diff, start, length):
+    """Add 1 to diff over the cyclic range [start, start + length)."""
+    if length <= 0:
+        return
+    start %= DIAL_SIZE
+    end = start + length
+    diff[start] += 1
+    if end <= DIAL_SIZE:
+        diff[end] -= 1
+    else:
+        diff[DIAL_SIZE] -= 1
+        diff[0] += 1
+        diff[end - DIAL_SIZE] -= 1
+
+
+def signed_distance(rotation):
+    """Parse a rotation like 'L37' into a signed distance (-37)."""
+    distance = int(rotation[1:])
+    return -distance if rotation[0] == 'L' else distance
+
+
+def summarise(rotations):
+    """Build the transfer table for a block of rotation lines."""
+    return summarise_signed(
+        signed_distance(line.strip()) for line in rotations if line.strip())
+
+
+def summarise_signed(distances):
+    """Build the transfer table for signed distances in O(n + 100).
+
+    A rotation of distance 100q + r from position x hits 0 q times plus once
+    more when x lies in an interval of length r (x in [1, r] going left,
+    [100 - r, 99] going right). With x = (p + offset) % 100, that interval is
+    a cyclic range of start positions p, accumulated in a difference array.
+    """
+    offset = 0
+    full_turns = 0
+    landings = [0] * DIAL_SIZE
+    diff = [0] * (DIAL_SIZE + 1)
+
+    for signed in distances:
+        q, r = divmod(abs(signed), DIAL_SIZE)
+        full_turns += q
+
+        if signed < 0:
+            _add_cyclic(diff, 1 - offset, r)
+        else:
+            _add_cyclic(diff, DIAL_SIZE - r - offset, r)
+        offset = (offset + signed) % DIAL_SIZE
+
+        landings[-offset % DIAL_SIZE] += 1
+
+    crossings = []
+    running = full_turns
+    for p in range(DIAL_SIZE):
+        running += diff[p]
+        crossings.append(running)
+
+    return offset, tuple(landings), tuple(crossings)
+
+
+def combine(first, second):
+    """Transfer table for running block first and then block second."""
+    off1, land1, cross1 = first
+    off2, land2, cross2 = second
+    landings = tuple(land1[p] + land2[(p + off1) % DIAL_SIZE] for p in range(DIAL_SIZE))
+    crossings = tuple(cross1[p] + cross2[(p + off1) % DIAL_SIZE] for p in range(DIAL_SIZE))
+    return (off1 + off2) % DIAL_SIZE, landings, crossings
+
+
+def _read_chunks(input_path, chunk_lines):
+    """Yield the input as lists of at most chunk_lines lines."""
+    with open(input_path) as f:
+        chunk = []
+        for line in f:
+            chunk.append(line)
+            if len(chunk) >= chunk_lines:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+# Below this size (about three chunks of chunk_lines) a pool costs more to
+# start than it saves
+PARALLEL_MIN_BYTES = 16 * 2 ** 20
+
+
+def solve_both(input_path, start=50, workers=None, chunk_lines=1_000_000):
+    """Solve both parts in one pass, summarising chunks on a process pool.
+
+    Chunks are summarised in parallel and folded in input order; workers=1
+    runs everything in this process. By default the pool is only used for
+    inputs of PARALLEL_MIN_BYTES or more.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+        if os.path.getsize(input_path) < PARALLEL_MIN_BYTES:
+            workers = 1
+    chunks = _read_chunks(input_path, chunk_lines)
+
+    table = IDENTITY
+    if workers == 1:
+        for chunk in chunks:
+            table = combine(table, summarise(chunk))
+    else:
+        import multiprocessing  # only for large inputs; it is slow to import
+
+        with multiprocessing.Pool(workers) as pool:
+            for summary in pool.imap(summarise, chunks):
+                table = combine(table, summary)
+
+    _, landings, crossings = table
+    return landings[start], crossings[start]
+
+
+class RotationIndex:
+    """Answers zero-landing/crossing queries over any window of a rotation log.
+
+    Built once in O(n): prefix sums of the unwrapped position (so any line's
+    signed distance is prefix[t + 1] - prefix[t]) and a segment tree of
+    transfer tables over blocks of block_size lines. A query walks O(log n)
+    tree nodes, each an O(1) lookup for the current position, and replays at
+    most two partial blocks line by line.
+    """
+
+    def __init__(self, distances, block_size=256):
+        self.block_size = block_size
+        self.prefix = array('q', [0])
+        for signed in distances:
+            self.prefix.append(self.prefix[-1] + signed)
+        self.n = len(self.prefix) - 1
+
+        # Bottom-up segment tree: leaves at [n_blocks, 2 * n_blocks)
+        self.n_blocks = -(-self.n // block_size)
+        self.tree = [IDENTITY] * (2 * self.n_blocks)
+        for k in range(self.n_blocks):
+            lo = k * block_size
+            hi = min(lo + block_size, self.n)
+            self.tree[self.n_blocks + k] = summarise_signed(
+                self.prefix[t + 1] - self.prefix[t] for t in range(lo, hi))
+        for node in range(self.n_blocks - 1, 0, -1):
+            self.tree[node] = combine(self.tree[2 * node], self.tree[2 * node + 1])
+
+    @classmethod
+    def from_file(cls, input_path, block_size=256):
+        with open(input_path) as f:
+            return cls((signed_distance(line.strip()) for line in f if line.strip()),
+                       block_size)
+
+    def _replay(self, lo, hi, position):
+        """Step through lines [lo, hi) one at a time from position."""
+        landings = 0
+        crossings = 0
+        prefix = self.prefix
+        for t in range(lo, hi):
+            before = position
+            after = position + prefix[t + 1] - prefix[t]
+            if after >= before:
+                crossings += after // DIAL_SIZE - before // DIAL_SIZE
+            else:
+                crossings += (before - 1) // DIAL_SIZE - (after - 1) // DIAL_SIZE
+            position = after % DIAL_SIZE
+            if position == 0:
+                landings += 1
+        return landings, crossings, position
+
+    def query(self, i, j, start=50):
+        """Zero landings and zero crossings over lines [i, j) from position start.
+
+        Returns (landings, crossings, end_position).
+        """
+        if not 0 <= i <= j <= self.n:
+            raise IndexError(f"window [{i}, {j}) outside log of {self.n} lines")
+
+        first_block = -(-i // self.block_size)
+        last_block = j // self.block_size
+        if first_block >= last_block:
+            return self._replay(i, j, start % DIAL_SIZE)
+
+        landings, crossings, position = self._replay(
+            i, first_block * self.block_size, start % DIAL_SIZE)
+
+        # Collect the covering nodes in left-to-right order
+        left_nodes = []
+        right_nodes = []
+        lo = first_block + self.n_blocks
+        hi = last_block + self.n_blocks
+        while lo < hi:
+            if lo & 1:
+                left_nodes.append(self.tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right_nodes.append(self.tree[hi])
+            lo >>= 1
+            hi >>= 1
+
+        for offset, node_landings, node_crossings in left_nodes + right_nodes[::-1]:
+            landings += node_landings[position]
+            crossings += node_crossings[position]
+            position = (position + offset) % DIAL_SIZE
+
+        tail_landings, tail_crossings, position = self._replay(
+            last_block * self.block_size, j, position)
+        return landings + tail_landings, crossings + tail_crossings, position
+
+
+def _vector_chunk(buf, position):
+    """Zero landings and crossings for a block of whole lines, from position.
+
+    buf is a uint8 array ending in a newline. Returns (landings, crossings,
+    end_position).
+    """
+    import numpy as np
+
+    if np.count_nonzero((buf == ord('\r')) | (buf == ord(' '))):
+        buf = buf[(buf != ord('\r')) & (buf != ord(' '))]
+    line_ends = np.flatnonzero(buf == ord('\n'))
+    if line_ends.size == 0:
+        return 0, 0, position
+    line_starts = np.empty_like(line_ends)
+    line_starts[0] = 0
+    line_starts[1:] = line_ends[:-1] + 1
+    n_digits = line_ends - line_starts - 1
+    if (n_digits < 0).any():  # blank lines
+        keep = n_digits >= 0
+        line_starts, line_ends, n_digits = line_starts[keep], line_ends[keep], n_digits[keep]
+        if line_ends.size == 0:
+            return 0, 0, position
+
+    # Parse one digit column at a time, right to left from each newline
+    distances = np.zeros(line_ends.size, dtype=np.int64)
+    idx = line_ends - 1
+    scale = 1
+    for k in range(int(n_digits.max())):
+        column = buf.take(idx).astype(np.int64)
+        column -= ord('0')
+        column *= n_digits > k
+        if scale > 1:
+            column *= scale
+        distances += column
+        idx -= 1
+        scale *= 10
+
+    left = buf.take(line_starts) == ord('L')
+    full_turns, rest = np.divmod(distances, DIAL_SIZE)
+    after = np.cumsum(np.where(left, -distances, distances))
+    after += position
+    after %= DIAL_SIZE
+    before = np.empty_like(after)
+    before[0] = position
+    before[1:] = after[:-1]
+
+    # As in count_zero_crossings: every full turn passes 0 once, and the
+    # remainder once more if it reaches 0 from before
+    landings = np.count_nonzero(after == 0)
+    crossings = (int(full_turns.sum())
+                 + np.count_nonzero(~left & (before + rest >= DIAL_SIZE))
+                 + np.count_nonzero(left & (before > 0) & (rest >= before)))
+    return int(landings), int(crossings), int(after[-1])
+
+
+def solve_vectorised(input_path, start=50, chunk_bytes=1 << 20):
+    """Solve both parts with NumPy, without any per-line Python work.
+
+    The file is streamed in blocks of about chunk_bytes, cut at the last
+    newline, so memory stays flat however long the log is. Each block is
+    parsed in bulk into signed distances; a cumulative sum mod 100 gives the
+    dial position after every rotation, and the position carries over to the
+    next block.
+    """
+    try:
+        import numpy as np  # optional, and imported here: it is slow to load
+    except ImportError:
+        raise ImportError("solve_vectorised requires numpy") from None
+
+    landings = 0
+    crossings = 0
+    position = start % DIAL_SIZE
+    pending = b''
+    with open(input_path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_bytes), b''):
+            data = pending + block
+            cut = data.rfind(b'\n') + 1
+            pending = data[cut:]
+            if cut:
+                block_landings, block_crossings, position = _vector_chunk(
+                    np.frombuffer(data, dtype=np.uint8, count=cut), position)
+                landings += block_landings
+                crossings += block_crossings
+    if pending:
+        block_landings, block_crossings, position = _vector_chunk(
+            np.frombuffer(pending + b'\n', dtype=np.uint8), position)
+        landings += block_landings
+        crossings += block_crossings
+
+    return landings, crossings
+
+
 if __name__ == "__main__":
-    result = solve("../input")
+    result, result2 = solve_both("input")
     print(f"Part 1: {result}")
-    result2 = solve_part2("../input")
     print(f"Part 2: {result2}")
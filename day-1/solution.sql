@@ -6,83 +6,50 @@
 -- Part 1: How many times does the dial land exactly on 0 after a rotation?
 -- Part 2: How many times does the dial pass through 0 during ANY rotation?
 --         (a big rotation like R1000 could cross 0 multiple times)
+--
+-- Instead of walking the rotations one at a time, we "unwrap" the dial:
+-- keep a running total of the signed distances (right +, left -) without
+-- wrapping at 100. The dial shows 0 exactly when that total is a multiple
+-- of 100, so both parts come out of consecutive running totals in a single
+-- window pass.
 
-WITH RECURSIVE
+WITH
 
--- first parse out the direction and distance from each line
-parsed AS (
+-- running position without wrapping, before and after each rotation
+unwrapped AS (
     SELECT
         line_num,
-        SUBSTRING(line, 1, 1) AS direction,
-        CAST(SUBSTRING(line, 2) AS INTEGER) AS distance
-    FROM day1_input
+        signed_distance,
+        50 + SUM(signed_distance::BIGINT) OVER (ORDER BY line_num) AS pos
+    FROM day1_rotations
 ),
 
--- now we walk through each rotation, tracking where we end up
--- and counting how many times we cross zero along the way
-positions AS (
-    -- start with the first rotation from position 50
+-- floor(pos / 100) counts the multiples of 100 at or below pos. SQL integer
+-- division truncates toward zero, so go through NUMERIC to floor negatives.
+moves AS (
     SELECT
-        line_num,
-        direction,
-        distance,
-        -- figure out where we land after this rotation
-        -- right adds, left subtracts, mod 100 to wrap around
-        CASE
-            WHEN direction = 'R' THEN (50 + distance) % 100
-            ELSE ((50 - distance) % 100 + 100) % 100
-        END AS pos,
-        -- for part 2: count how many times we hit zero during this rotation
-        -- if going right from position P by distance D:
-        --   we first hit 0 after (100 - P) steps, then every 100 after that
-        -- if going left from position P by distance D:
-        --   we first hit 0 after P steps, then every 100 after that
-        CASE
-            WHEN direction = 'R' THEN
-                CASE
-                    WHEN 50 = 0 THEN distance / 100
-                    WHEN distance >= (100 - 50) THEN (distance - (100 - 50)) / 100 + 1
-                    ELSE 0
-                END
-            ELSE
-                CASE
-                    WHEN 50 = 0 THEN distance / 100
-                    WHEN distance >= 50 THEN (distance - 50) / 100 + 1
-                    ELSE 0
-                END
-        END AS zero_crossings
-    FROM parsed
-    WHERE line_num = 1
-
-    UNION ALL
+        pos,
+        pos - signed_distance AS prev_pos,
+        FLOOR(pos::NUMERIC / 100) AS pos_hundreds,
+        FLOOR((pos - 1)::NUMERIC / 100) AS below_pos_hundreds,
+        FLOOR((pos - signed_distance)::NUMERIC / 100) AS prev_hundreds,
+        FLOOR((pos - signed_distance - 1)::NUMERIC / 100) AS below_prev_hundreds
+    FROM unwrapped
+),
 
-    -- each subsequent rotation starts from where the previous one ended
+-- zeros passed during each rotation: multiples of 100 in (prev, pos] going
+-- right, or in [pos, prev) going left
+crossings AS (
     SELECT
-        p.line_num,
-        p.direction,
-        p.distance,
-        CASE
-            WHEN p.direction = 'R' THEN (prev.pos + p.distance) % 100
-            ELSE ((prev.pos - p.distance) % 100 + 100) % 100
-        END AS pos,
+        pos,
         CASE
-            WHEN p.direction = 'R' THEN
-                CASE
-                    WHEN prev.pos = 0 THEN p.distance / 100
-                    WHEN p.distance >= (100 - prev.pos) THEN (p.distance - (100 - prev.pos)) / 100 + 1
-                    ELSE 0
-                END
-            ELSE
-                CASE
-                    WHEN prev.pos = 0 THEN p.distance / 100
-                    WHEN p.distance >= prev.pos THEN (p.distance - prev.pos) / 100 + 1
-                    ELSE 0
-                END
+            WHEN pos >= prev_pos THEN pos_hundreds - prev_hundreds
+            ELSE below_prev_hundreds - below_pos_hundreds
         END AS zero_crossings
-    FROM parsed p
-    JOIN positions prev ON p.line_num = prev.line_num + 1
+    FROM moves
 )
 
-SELECT 'Part 1' AS part, COUNT(*) FILTER (WHERE pos = 0) AS answer FROM positions
+SELECT 'Part 1' AS part, COUNT(*) FILTER (WHERE pos % 100 = 0) AS answer FROM crossings
 UNION ALL
-SELECT 'Part 2' AS part, SUM(zero_crossings) AS answer FROM positions;
+-- COALESCE: SUM over no rotations is NULL, the Python solver answers 0
+SELECT 'Part 2' AS part, COALESCE(SUM(zero_crossings), 0)::BIGINT AS answer FROM crossings;
@@ -9,6 +9,11 @@ Part 2: Find minimum button presses to reach joltage targets (additive).
 import re
 from itertools import combinations, product
 
+try:
+    import parse_cache
+except ImportError:
+    parse_cache = None
+
 
 def parse_line(line):
     """Parse a machine line into target pattern, buttons, and joltage."""
@@ -211,19 +216,34 @@ def solve_machine_part2(buttons, joltage):
     return best if best != float('inf') else float('inf')
 
 
-def solve(input_path):
+def read_machines(input_path):
+    """(target, buttons, joltage) for every machine."""
     with open(input_path) as f:
         lines = f.read().strip().split('\n')
+    return [parse_line(line) for line in lines]
+
+
+def parse_input(input_path):
+    if parse_cache is None:
+        return read_machines(input_path)
+    return parse_cache.load(input_path, "day10-machines", read_machines)
+
 
-    total_part1 = 0
-    total_part2 = 0
+def solve_part1(machines):
+    return sum(solve_machine_part1(target, buttons) for target, buttons, _ in machines)
+
+
+def solve_part2(machines):
+    return sum(solve_machine_part2(buttons, joltage) for _, buttons, joltage in machines)
+
+
+def solve(input_path):
+    machines = parse_input(input_path)
 
-    for line in lines:
-        target, buttons, joltage = parse_line(line)
-        total_part1 += solve_machine_part1(target, buttons)
-        total_part2 += solve_machine_part2(buttons, joltage)
+    part1 = solve_part1(machines)
+    part2 = solve_part2(machines)
 
-    return total_part1, total_part2
+    return part1, part2
 
 
 if __name__ == "__main__":
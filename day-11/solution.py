@@ -9,10 +9,15 @@ Part 2: Count paths from 'svr' to 'out' that visit both 'dac' and 'fft'.
 from collections import defaultdict
 from functools import lru_cache
 
+try:
+    import parse_cache
+except ImportError:
+    parse_cache = None
 
-def parse_input(input_path):
+
+def read_graph(input_path):
     """Parse input into a graph (adjacency list)."""
-    graph = defaultdict(list)
+    graph = {}
 
     with open(input_path) as f:
         for line in f:
@@ -29,6 +34,13 @@ def parse_input(input_path):
     return graph
 
 
+def parse_input(input_path):
+    """The graph as a defaultdict, so nodes without edges have none."""
+    if parse_cache is None:
+        return defaultdict(list, read_graph(input_path))
+    return defaultdict(list, parse_cache.load(input_path, "day11-graph", read_graph))
+
+
 def count_paths(graph, start, end):
     """Count all paths from start to end using memoized DFS."""
     memo = {}
@@ -53,12 +65,12 @@ def count_paths(graph, start, end):
     return dfs(start)
 
 
-def solve(input_path):
-    graph = parse_input(input_path)
+def solve_part1(graph):
+    return count_paths(graph, 'you', 'out')
 
-    part1 = count_paths(graph, 'you', 'out')
 
-    # Part 2: paths from svr to out visiting both dac and fft
+def solve_part2(graph):
+    # Paths from svr to out visiting both dac and fft
     # Two cases:
     # 1. svr -> dac -> fft -> out
     # 2. svr -> fft -> dac -> out
@@ -71,8 +83,15 @@ def solve(input_path):
     fft_to_dac = count_paths(graph, 'fft', 'dac')
     dac_to_out = count_paths(graph, 'dac', 'out')
 
-    part2 = (svr_to_dac * dac_to_fft * fft_to_out +
-             svr_to_fft * fft_to_dac * dac_to_out)
+    return (svr_to_dac * dac_to_fft * fft_to_out +
+            svr_to_fft * fft_to_dac * dac_to_out)
+
+
+def solve(input_path):
+    graph = parse_input(input_path)
+
+    part1 = solve_part1(graph)
+    part2 = solve_part2(graph)
 
     return part1, part2
 
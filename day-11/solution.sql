@@ -1,98 +1,125 @@
 -- Day 11: Reactor
 -- Part 1: Count all paths from 'you' to 'out' in a directed graph
 -- Part 2: Count paths from 'svr' to 'out' that visit both 'dac' and 'fft'
+--
+-- The graph is a DAG, so we give every node a topological level once: sinks
+-- are level 0 and every other node sits one above its highest successor.
+-- Path counts can then be filled in level by level, since everything a node
+-- points at is on a lower level and already counted. All the targets we need
+-- are counted in the same pass, one grouped UPDATE per level.
 
--- Create a function to count paths using memoization
--- This version properly handles nodes that don't lead to the target
-CREATE OR REPLACE FUNCTION count_paths_day11(start_node TEXT, end_node TEXT) RETURNS BIGINT AS $$
+-- Build d11_levels(node, level) from the pre-parsed, indexed day11_edges.
+-- Works from the sinks up: each round finishes the nodes whose last pending
+-- successor was placed in the previous round. Returns the highest level.
+CREATE OR REPLACE FUNCTION build_levels_day11() RETURNS INT AS $$
 DECLARE
-    changed BOOLEAN := TRUE;
-    iterations INT := 0;
-    result BIGINT;
+    lvl INT := 0;
 BEGIN
-    -- Create temp table for edges
-    DROP TABLE IF EXISTS d11_edges;
-    CREATE TEMP TABLE d11_edges AS
-    SELECT
-        split_part(line, ': ', 1) AS src,
-        unnest(string_to_array(split_part(line, ': ', 2), ' ')) AS dst
-    FROM day11_input
-    WHERE line LIKE '%: %';
+    DROP TABLE IF EXISTS d11_levels;
+    CREATE TEMP TABLE d11_levels AS
+    SELECT n.node, COUNT(e.dst)::INT AS pending, NULL::INT AS level
+    FROM (SELECT src AS node FROM day11_edges UNION SELECT dst FROM day11_edges) n
+    LEFT JOIN day11_edges e ON e.src = n.node
+    GROUP BY n.node;
+    ALTER TABLE d11_levels ADD PRIMARY KEY (node);
+    CREATE INDEX ON d11_levels (level);
 
-    CREATE INDEX ON d11_edges(src);
-    CREATE INDEX ON d11_edges(dst);
+    UPDATE d11_levels SET level = 0 WHERE pending = 0;
 
-    -- Create temp table for path counts (memoization)
-    -- NULL means not computed yet, 0 means no paths to target
-    DROP TABLE IF EXISTS d11_paths;
-    CREATE TEMP TABLE d11_paths (
-        node TEXT PRIMARY KEY,
-        paths BIGINT  -- NULL = not computed, >= 0 = computed
-    );
+    LOOP
+        -- predecessors of the nodes placed last round lose those successors;
+        -- the ones left with nothing pending go on the next level
+        UPDATE d11_levels l
+        SET pending = l.pending - d.finished,
+            level = CASE WHEN l.pending = d.finished THEN lvl + 1 END
+        FROM (
+            SELECT e.src, COUNT(*)::INT AS finished
+            FROM d11_levels placed
+            JOIN day11_edges e ON e.dst = placed.node
+            WHERE placed.level = lvl
+            GROUP BY e.src
+        ) d
+        WHERE l.node = d.src;
 
-    -- Initialize all nodes with NULL (not computed)
-    INSERT INTO d11_paths (node, paths)
-    SELECT DISTINCT src, NULL FROM d11_edges
-    UNION
-    SELECT DISTINCT dst, NULL FROM d11_edges;
+        EXIT WHEN NOT EXISTS (SELECT 1 FROM d11_levels WHERE level = lvl + 1);
+        lvl := lvl + 1;
+    END LOOP;
 
-    -- Base case: end_node has 1 path to itself
-    UPDATE d11_paths SET paths = 1 WHERE node = end_node;
+    ANALYZE d11_levels;
+    RETURN lvl;
+END;
+$$ LANGUAGE plpgsql;
 
-    -- Mark nodes with no outgoing edges (sinks other than end_node) as 0
-    UPDATE d11_paths SET paths = 0
-    WHERE node != end_node
-      AND NOT EXISTS (SELECT 1 FROM d11_edges WHERE src = d11_paths.node);
+-- Count the paths from every node to each of the targets in one level-ordered
+-- pass. Levels are built on first use and then cached for the session.
+CREATE OR REPLACE FUNCTION count_paths_day11(targets TEXT[])
+RETURNS TABLE (from_node TEXT, to_node TEXT, path_count BIGINT) AS $$
+DECLARE
+    max_level INT;
+BEGIN
+    IF to_regclass('pg_temp.d11_levels') IS NULL THEN
+        PERFORM build_levels_day11();
+    END IF;
+    SELECT MAX(level) INTO max_level FROM d11_levels;
 
-    -- Iteratively compute path counts
-    WHILE changed LOOP
-        changed := FALSE;
-        iterations := iterations + 1;
+    -- a target has one path to itself; everything else starts at 0, which is
+    -- already right for the sinks
+    DROP TABLE IF EXISTS d11_paths;
+    CREATE TEMP TABLE d11_paths AS
+    SELECT l.node, t.target, CASE WHEN l.node = t.target THEN 1 ELSE 0 END::BIGINT AS paths
+    FROM d11_levels l
+    CROSS JOIN UNNEST(targets) AS t(target);
+    ALTER TABLE d11_paths ADD PRIMARY KEY (node, target);
 
-        -- Update nodes where ALL children have been computed
-        WITH ready_nodes AS (
-            SELECT p.node
-            FROM d11_paths p
-            WHERE p.paths IS NULL
-              AND NOT EXISTS (
-                  SELECT 1 FROM d11_edges e
-                  JOIN d11_paths pc ON e.dst = pc.node
-                  WHERE e.src = p.node AND pc.paths IS NULL
-              )
-        ),
-        computed AS (
-            SELECT e.src AS node, COALESCE(SUM(pc.paths), 0) AS paths
-            FROM d11_edges e
-            JOIN d11_paths pc ON e.dst = pc.node
-            WHERE e.src IN (SELECT node FROM ready_nodes)
-            GROUP BY e.src
-        )
+    FOR lvl IN 1..COALESCE(max_level, 0) LOOP
         UPDATE d11_paths p
-        SET paths = c.paths
-        FROM computed c
-        WHERE p.node = c.node;
-
-        IF FOUND THEN
-            changed := TRUE;
-        END IF;
-
-        IF iterations > 1000 THEN
-            RAISE EXCEPTION 'Too many iterations';
-        END IF;
+        SET paths = s.total
+        FROM (
+            SELECT e.src, c.target, SUM(c.paths)::BIGINT AS total
+            FROM d11_levels l
+            JOIN day11_edges e ON e.src = l.node
+            JOIN d11_paths c ON c.node = e.dst
+            WHERE l.level = lvl
+            GROUP BY e.src, c.target
+        ) s
+        WHERE p.node = s.src AND p.target = s.target AND p.node <> p.target;
     END LOOP;
 
-    SELECT COALESCE(paths, 0) INTO result FROM d11_paths WHERE node = start_node;
-    RETURN COALESCE(result, 0);
+    RETURN QUERY SELECT node, target, paths FROM d11_paths;
 END;
 $$ LANGUAGE plpgsql;
 
+WITH
+
+-- one pass for all three targets
+counts AS (
+    SELECT from_node, to_node, path_count FROM count_paths_day11(ARRAY['out', 'dac', 'fft'])
+),
+
+-- one column per target
+to_target AS (
+    SELECT
+        from_node AS node,
+        MAX(path_count) FILTER (WHERE to_node = 'out') AS to_out,
+        MAX(path_count) FILTER (WHERE to_node = 'dac') AS to_dac,
+        MAX(path_count) FILTER (WHERE to_node = 'fft') AS to_fft
+    FROM counts
+    GROUP BY from_node
+)
+
 -- Part 1: paths from 'you' to 'out'
-SELECT 'Part 1' AS part, count_paths_day11('you', 'out') AS answer
+SELECT 'Part 1' AS part, COALESCE((SELECT to_out FROM to_target WHERE node = 'you'), 0) AS answer
 
 UNION ALL
 
 -- Part 2: paths from 'svr' to 'out' visiting both 'dac' and 'fft'
 -- Two orderings: svr->dac->fft->out OR svr->fft->dac->out
+-- Left joins from a single row, so a missing node counts 0 paths instead of
+-- dropping the row
 SELECT 'Part 2' AS part,
-    count_paths_day11('svr', 'dac') * count_paths_day11('dac', 'fft') * count_paths_day11('fft', 'out') +
-    count_paths_day11('svr', 'fft') * count_paths_day11('fft', 'dac') * count_paths_day11('dac', 'out') AS answer;
+    COALESCE(svr.to_dac, 0) * COALESCE(dac.to_fft, 0) * COALESCE(fft.to_out, 0)
+    + COALESCE(svr.to_fft, 0) * COALESCE(fft.to_dac, 0) * COALESCE(dac.to_out, 0) AS answer
+FROM (VALUES (1)) AS one (x)
+LEFT JOIN to_target svr ON svr.node = 'svr'
+LEFT JOIN to_target dac ON dac.node = 'dac'
+LEFT JOIN to_target fft ON fft.node = 'fft';
@@ -3,12 +3,27 @@
 Day 12: Christmas Tree Farm
 
 Part 1: Count how many regions can fit all their required presents (polyominoes).
-Uses greedy placement with retry for efficiency on large regions.
+
+Regions are decided in tiers: an O(1) area/bounding-box check settles the easy
+cases, greedy placement with retry on a row-bitmask grid finds packings for
+roomy regions, and an exact backtracking search (with a per-region time budget)
+settles the tight ones.
 """
 
+import multiprocessing
+import os
 import random
+import sys
+import time
+from collections import namedtuple
+from functools import lru_cache
 
-def parse_input(input_path):
+try:
+    import parse_cache
+except ImportError:
+    parse_cache = None
+
+def read_input(input_path):
     """Parse input into shapes and regions."""
     with open(input_path) as f:
         content = f.read()
@@ -52,6 +67,12 @@ def parse_input(input_path):
     return shapes, regions
 
 
+def parse_input(input_path):
+    if parse_cache is None:
+        return read_input(input_path)
+    return parse_cache.load(input_path, "day12-input", read_input)
+
+
 def get_orientations(shape):
     """Get all unique orientations of a shape."""
     orientations = set()
@@ -78,9 +99,97 @@ def get_orientations(shape):
     return [set(o) for o in orientations]
 
 
-def can_fit_greedy(width, height, counts, shapes, all_orientations, max_retries=10):
-    """Try to fit using greedy placement with multiple random orderings."""
-    shape_sizes = [len(s) for s in shapes]
+# One precomputed orientation of a shape:
+#   id         canonical id, unique across the whole catalogue
+#   shape_idx  index of the shape it belongs to
+#   cells      sorted (row, col) offsets, normalised to start at (0, 0)
+#   height, width  bounding box
+#   row_masks  bit c of row_masks[r] is set for every cell (r, c)
+#   row_bits   the column offsets set in each row mask
+#   anchor_c   column of the first cell in row-major order (always in row 0)
+Orientation = namedtuple(
+    'Orientation',
+    'id shape_idx cells height width row_masks row_bits anchor_c')
+
+
+def build_catalogue(shapes):
+    """Precompute every orientation of every shape, once per input.
+
+    Returns a tuple (one entry per shape) of tuples of Orientation, ordered by
+    their sorted cells so ids and placement order are reproducible.
+    """
+    catalogue = []
+    next_id = 0
+    for shape_idx, shape in enumerate(shapes):
+        entries = []
+        for orient in sorted(tuple(sorted(o)) for o in get_orientations(shape)):
+            height = max(r for r, c in orient) + 1
+            width = max(c for r, c in orient) + 1
+            row_masks = [0] * height
+            for r, c in orient:
+                row_masks[r] |= 1 << c
+            row_bits = tuple(
+                tuple(c for c in range(width) if mask >> c & 1) for mask in row_masks
+            )
+            anchor_c = min(c for r, c in orient if r == 0)
+            entries.append(Orientation(next_id, shape_idx, orient, height, width,
+                                       tuple(row_masks), row_bits, anchor_c))
+            next_id += 1
+        catalogue.append(tuple(entries))
+    return tuple(catalogue)
+
+
+@lru_cache(maxsize=16)
+def _cached_catalogue(shapes):
+    return build_catalogue(shapes)
+
+
+def catalogue_for(shapes):
+    """build_catalogue, memoised on the shapes for the 16 most recent shape sets.
+
+    Catalogues are immutable, so inputs sharing a shape set (a batch of them
+    solved in one process, say) build it only once.
+    """
+    return _cached_catalogue(tuple(frozenset(shape) for shape in shapes))
+
+
+def find_placement(grid, width, height, first_row, orientations):
+    """Find the first free placement of any orientation, scanning from first_row.
+
+    Rows above first_row are completely filled, so no placement can use them.
+    For each candidate top row, the set of column shifts that collide with the
+    grid is built from the row bitmasks; the lowest clear bit is the placement.
+    """
+    for orient in orientations:
+        if orient.width > width:
+            continue
+        shift_limit = (1 << (width - orient.width + 1)) - 1
+        for start_r in range(first_row, height - orient.height + 1):
+            blocked = 0
+            for i, bits in enumerate(orient.row_bits):
+                grid_row = grid[start_r + i]
+                if grid_row:
+                    for b in bits:
+                        blocked |= grid_row >> b
+            free = ~blocked & shift_limit
+            if free:
+                start_c = (free & -free).bit_length() - 1
+                return orient, start_r, start_c
+    return None, None, None
+
+
+def can_fit_greedy(width, height, counts, catalogue, max_retries=10, rng=None):
+    """Try to fit using greedy placement with multiple random orderings.
+
+    The region is a list of row bitmasks (bit c of grid[r] is cell (r, c)), so
+    testing and committing a placement is a few shifts, ANDs and ORs per row.
+    Orderings are shuffled with rng (a random.Random), so results depend only
+    on its seed.
+    """
+    if rng is None:
+        rng = random.Random(0)
+
+    shape_sizes = [len(orients[0].cells) for orients in catalogue]
 
     # Build list of pieces
     pieces = []
@@ -97,37 +206,27 @@ def can_fit_greedy(width, height, counts, shapes, all_orientations, max_retries=
     if not pieces:
         return True
 
+    full_row = (1 << width) - 1
+
     # Try multiple random orderings
     for attempt in range(max_retries):
         if attempt > 0:
-            random.shuffle(pieces)
-
-        grid = [[False] * width for _ in range(height)]
-
-        def find_placement(shape_idx):
-            """Find first valid placement for a shape."""
-            for orient in all_orientations[shape_idx]:
-                max_r = max(r for r, c in orient)
-                max_c = max(c for r, c in orient)
-                for start_r in range(height - max_r):
-                    for start_c in range(width - max_c):
-                        valid = True
-                        for r, c in orient:
-                            if grid[start_r + r][start_c + c]:
-                                valid = False
-                                break
-                        if valid:
-                            return orient, start_r, start_c
-            return None, None, None
+            rng.shuffle(pieces)
+
+        grid = [0] * height
+        first_row = 0  # every row above this one is completely filled
 
         success = True
         for shape_idx in pieces:
-            orient, start_r, start_c = find_placement(shape_idx)
+            orient, start_r, start_c = find_placement(
+                grid, width, height, first_row, catalogue[shape_idx])
             if orient is None:
                 success = False
                 break
-            for r, c in orient:
-                grid[start_r + r][start_c + c] = True
+            for i, mask in enumerate(orient.row_masks):
+                grid[start_r + i] |= mask << start_c
+            while first_row < height and grid[first_row] == full_row:
+                first_row += 1
 
         if success:
             return True
@@ -135,21 +234,214 @@ def can_fit_greedy(width, height, counts, shapes, all_orientations, max_retries=
     return False
 
 
-def solve(input_path):
+def classify_region(width, height, counts, catalogue):
+    """O(1) verdict from area and bounding boxes: True, False, or None if unsure.
+
+    Every shape fits in a d x d box (d = largest bounding dimension), so if the
+    region has at least as many disjoint d x d blocks as there are pieces, each
+    piece gets its own block and the region trivially fits.
+    """
+    total_cells = sum(count * len(orients[0].cells)
+                      for count, orients in zip(counts, catalogue))
+    if total_cells > width * height:
+        return False
+
+    box = max(max(o.height, o.width) for orients in catalogue for o in orients)
+    if sum(counts) <= (width // box) * (height // box):
+        return True
+
+    return None
+
+
+class SearchTimeout(Exception):
+    """Raised when an exact search exceeds its time budget."""
+
+
+def can_fit_exact(width, height, counts, catalogue, time_budget=None):
+    """Decide exactly whether all pieces fit, by backtracking on the first free cell.
+
+    The board is a single int with bit r * width + c for cell (r, c). At each
+    step the first undecided cell is either covered by a piece whose anchor
+    (its first cell in row-major order) lands there, or left empty, which uses
+    up one cell of slack. Rows run along the shorter side of the region to keep
+    the frontier narrow. Identical pieces are placed by count rather than as
+    distinct copies, so no permutation of copies is ever explored twice, and
+    failed (board, counts) states are remembered.
+
+    Returns True/False, or None if time_budget seconds pass without a verdict.
+    """
+    # Orientations are closed under transposition, so scan along the short side
+    if width > height:
+        width, height = height, width
+
+    area = width * height
+    shape_sizes = [len(orients[0].cells) for orients in catalogue]
+    remaining = sum(count * size for count, size in zip(counts, shape_sizes))
+    if remaining > area:
+        return False
+    if remaining == 0:
+        return True
+
+    # Board mask of each orientation placed at the origin, by orientation id
+    board_masks = {}
+    for orients in catalogue:
+        for orient in orients:
+            mask = 0
+            for r, row_mask in enumerate(orient.row_masks):
+                mask |= row_mask << (r * width)
+            board_masks[orient.id] = mask
+
+    placement_cache = {}
+
+    def placements(shape_idx, p):
+        """Board masks of every orientation of a shape anchored at cell p."""
+        key = (shape_idx, p)
+        if key not in placement_cache:
+            pr, pc = divmod(p, width)
+            masks = []
+            for orient in catalogue[shape_idx]:
+                start_c = pc - orient.anchor_c
+                if (start_c < 0 or start_c + orient.width > width
+                        or pr + orient.height > height):
+                    continue
+                masks.append(board_masks[orient.id] << (pr * width + start_c))
+            placement_cache[key] = masks
+        return placement_cache[key]
+
+    counts = list(counts)
+    failed = set()
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    nodes = 0
+
+    def search(occupied, p, remaining, slack):
+        nonlocal nodes
+        if remaining == 0:
+            return True
+
+        nodes += 1
+        if deadline is not None and nodes % 1024 == 0 and time.perf_counter() > deadline:
+            raise SearchTimeout
+
+        while occupied >> p & 1:
+            p += 1
+
+        key = (occupied, tuple(counts))
+        if key in failed:
+            return False
+
+        for shape_idx, count in enumerate(counts):
+            if count == 0:
+                continue
+            for mask in placements(shape_idx, p):
+                if mask & occupied:
+                    continue
+                counts[shape_idx] -= 1
+                found = search(occupied | mask, p + 1,
+                               remaining - shape_sizes[shape_idx], slack)
+                counts[shape_idx] += 1
+                if found:
+                    return True
+
+        # Leave this cell empty
+        if slack > 0 and search(occupied | (1 << p), p + 1, remaining, slack - 1):
+            return True
+
+        failed.add(key)
+        return False
+
+    # Depth is bounded by pieces plus empty cells, which can exceed the default
+    # recursion limit on large tight regions
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(recursion_limit, area + 1000))
+    try:
+        return search(0, 0, remaining, area - remaining)
+    except SearchTimeout:
+        return None
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+
+
+def can_fit(width, height, counts, catalogue, time_budget=5.0, rng=None):
+    """Decide whether a region fits all its pieces, cheapest method first.
+
+    A timed-out exact search falls back to the greedy verdict (False).
+    """
+    verdict = classify_region(width, height, counts, catalogue)
+    if verdict is not None:
+        return verdict
+
+    if can_fit_greedy(width, height, counts, catalogue, rng=rng):
+        return True
+
+    verdict = can_fit_exact(width, height, counts, catalogue, time_budget)
+    return bool(verdict)
+
+
+# Orientation catalogue shared by every region, set once per worker process
+_worker_catalogue = None
+
+
+def _init_worker(catalogue):
+    global _worker_catalogue
+    _worker_catalogue = catalogue
+
+
+def _evaluate_chunk(chunk):
+    """Evaluate a chunk of (index, seed, region) jobs in a worker."""
+    results = []
+    for index, seed, (w, h, counts) in chunk:
+        fits = can_fit(w, h, counts, _worker_catalogue, rng=random.Random(seed))
+        results.append((index, fits))
+    return results
+
+
+def report_progress(done, total, valid, elapsed):
+    """Default progress callback: one status line with ETA on stderr."""
+    eta = elapsed / done * (total - done) if done else 0.0
+    print(f"Processed {done}/{total}, {valid} valid, "
+          f"{elapsed:.1f}s elapsed, ETA {eta:.1f}s", file=sys.stderr)
+
+
+def solve(input_path, workers=None, chunk_size=25, seed=42, progress=report_progress):
+    """Count the regions that fit, spreading them over a process pool.
+
+    Each region gets its own RNG seeded from seed and its index, so the answer
+    does not depend on the number of workers or the order chunks finish in.
+    progress(done, total, valid, elapsed) is called after every chunk; pass
+    None to disable it. workers defaults to every core; workers=1 runs in
+    this process.
+    """
     shapes, regions = parse_input(input_path)
-    all_orientations = [get_orientations(shape) for shape in shapes]
+    catalogue = catalogue_for(shapes)
+
+    jobs = [(i, seed + i, region) for i, region in enumerate(regions)]
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+    workers = workers or os.cpu_count() or 1
 
+    start_time = time.perf_counter()
+    done = 0
     count = 0
-    for i, (w, h, counts) in enumerate(regions):
-        if can_fit_greedy(w, h, counts, shapes, all_orientations):
-            count += 1
-        if (i + 1) % 100 == 0:
-            print(f"Processed {i+1}/{len(regions)}, {count} valid...")
+
+    def record(results):
+        nonlocal done, count
+        done += len(results)
+        count += sum(1 for _, fits in results if fits)
+        if progress is not None:
+            progress(done, len(regions), count, time.perf_counter() - start_time)
+
+    if workers == 1:
+        _init_worker(catalogue)
+        for chunk in chunks:
+            record(_evaluate_chunk(chunk))
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker,
+                                  initargs=(catalogue,)) as pool:
+            for results in pool.imap_unordered(_evaluate_chunk, chunks):
+                record(results)
 
     return count
 
 
 if __name__ == "__main__":
-    random.seed(42)
     p1 = solve("input")
     print(f"Part 1: {p1}")
@@ -8,86 +8,85 @@
 --         Once you remove a roll, its neighbors might become accessible.
 --         How many total rolls can we remove?
 --
--- For part 2 we use a recursive approach:
--- store all the roll positions in an array, then each iteration
--- we filter out the ones with < 4 neighbors and keep the rest.
+-- For part 2 we peel the grid like an onion: keep every roll in an indexed
+-- table with its neighbor count, and each round remove only the frontier
+-- (the rolls that just became accessible) and decrement their neighbors.
+-- A roll can only become accessible when one of its neighbors is removed,
+-- so the next frontier is found among the cells we just decremented, and
+-- each round costs time proportional to the rolls it removes.
 
-WITH RECURSIVE
-
--- find all the @ positions in the grid
-cells AS (
-    SELECT
-        line_num AS row,
-        pos AS col
-    FROM day4_input
-    CROSS JOIN LATERAL generate_series(1, LENGTH(line)) AS pos
-    WHERE SUBSTRING(line, pos, 1) = '@'
-),
-
--- Part 1: count neighbors for each cell using a join
--- a neighbor is any cell within 1 step in any direction (including diagonal)
-neighbor_counts AS (
+CREATE OR REPLACE FUNCTION peel_rolls_day4() RETURNS TABLE (part TEXT, answer BIGINT) AS $$
+DECLARE
+    step INT := 0;
+    accessible BIGINT;
+    removed BIGINT := 0;
+    peeled BIGINT;
+BEGIN
+    -- every roll with its neighbor count (rolls come pre-parsed in day4_cells)
+    -- a neighbor is any roll within 1 step in any direction (including diagonal)
+    DROP TABLE IF EXISTS d4_rolls;
+    CREATE TEMP TABLE d4_rolls AS
     SELECT
         c.row,
         c.col,
-        COUNT(n.row) AS neighbor_count
-    FROM cells c
-    LEFT JOIN cells n ON
+        COUNT(n.row)::INT AS neighbors
+    FROM day4_cells c
+    LEFT JOIN day4_cells n ON
         n.row BETWEEN c.row - 1 AND c.row + 1
         AND n.col BETWEEN c.col - 1 AND c.col + 1
         AND NOT (n.row = c.row AND n.col = c.col)
-    GROUP BY c.row, c.col
-),
+    GROUP BY c.row, c.col;
+    ALTER TABLE d4_rolls ADD PRIMARY KEY (row, col);
+    ANALYZE d4_rolls;
 
-part1_result AS (
-    SELECT COUNT(*) AS answer
-    FROM neighbor_counts
-    WHERE neighbor_count < 4
-),
+    -- the rolls to remove in each round, starting with everything accessible
+    DROP TABLE IF EXISTS d4_frontier;
+    CREATE TEMP TABLE d4_frontier (round INT, row INT, col INT, PRIMARY KEY (round, row, col));
+    INSERT INTO d4_frontier
+    SELECT 0, row, col FROM d4_rolls WHERE neighbors < 4;
 
--- Part 2: simulate removing accessible rolls iteratively
--- we store positions as "row,col" strings in an array
--- each iteration we keep only the cells that have >= 4 neighbors
-grid_state(iter, coords, prev_size) AS (
-    -- start with all cells
-    SELECT 0, ARRAY_AGG(row || ',' || col), 0::BIGINT
-    FROM cells
+    -- Part 1 is just the first frontier
+    GET DIAGNOSTICS accessible = ROW_COUNT;
+    peeled := accessible;
 
-    UNION ALL
+    WHILE peeled > 0 LOOP
+        removed := removed + peeled;
 
-    -- each round: filter to keep only cells with 4+ neighbors
-    SELECT
-        gs.iter + 1,
-        ARRAY(
-            SELECT coord
-            FROM UNNEST(gs.coords) AS coord
-            WHERE (
-                -- count how many neighbors this cell has
-                SELECT COUNT(*)
-                FROM UNNEST(gs.coords) AS other
-                WHERE other != coord
-                  AND ABS(SPLIT_PART(coord, ',', 1)::INT - SPLIT_PART(other, ',', 1)::INT) <= 1
-                  AND ABS(SPLIT_PART(coord, ',', 2)::INT - SPLIT_PART(other, ',', 2)::INT) <= 1
-            ) >= 4
+        DELETE FROM d4_rolls r
+        USING d4_frontier f
+        WHERE f.round = step AND r.row = f.row AND r.col = f.col;
+
+        -- each surviving neighbor loses one for every removed roll next to it;
+        -- everything left had 4+ neighbors, so the ones that drop below 4 are
+        -- exactly the next frontier
+        WITH lost AS (
+            SELECT r.row, r.col, COUNT(*)::INT AS lost
+            FROM d4_frontier f
+            JOIN d4_rolls r ON
+                r.row BETWEEN f.row - 1 AND f.row + 1
+                AND r.col BETWEEN f.col - 1 AND f.col + 1
+            WHERE f.round = step
+            GROUP BY r.row, r.col
         ),
-        CARDINALITY(gs.coords)
-    FROM grid_state gs
-    -- keep going until nothing changes
-    WHERE gs.iter < 100
-      AND CARDINALITY(gs.coords) != gs.prev_size
-),
+        updated AS (
+            UPDATE d4_rolls r
+            SET neighbors = r.neighbors - l.lost
+            FROM lost l
+            WHERE r.row = l.row AND r.col = l.col
+            RETURNING r.row, r.col, r.neighbors
+        )
+        INSERT INTO d4_frontier
+        SELECT step + 1, u.row, u.col FROM updated u WHERE u.neighbors < 4;
 
--- the answer is how many we started with minus how many are left at the end
-final_state AS (
-    SELECT coords
-    FROM grid_state
-    WHERE iter = (SELECT MAX(iter) FROM grid_state)
-),
+        GET DIAGNOSTICS peeled = ROW_COUNT;
+        step := step + 1;
+    END LOOP;
 
-part2_result AS (
-    SELECT (SELECT COUNT(*) FROM cells) - CARDINALITY((SELECT coords FROM final_state)) AS answer
-)
+    RETURN QUERY
+    SELECT 'Part 1'::TEXT, accessible
+    UNION ALL
+    SELECT 'Part 2'::TEXT, removed;
+END;
+$$ LANGUAGE plpgsql;
 
-SELECT 'Part 1' AS part, answer FROM part1_result
-UNION ALL
-SELECT 'Part 2' AS part, answer FROM part2_result;
+SELECT part, answer FROM peel_rolls_day4();
@@ -3,117 +3,139 @@
 -- Part 1: Connect 1000 closest pairs, multiply 3 largest circuit sizes.
 -- Part 2: Connect until one circuit, multiply X coords of last pair.
 --
--- Part 1 uses Union-Find simulation (limited to 1000 steps).
--- Part 2 uses Prim's MST algorithm (only n-1 iterations needed).
-
-WITH RECURSIVE
-
--- parse coordinates
-points AS (
-    SELECT
-        line_num AS id,
-        SPLIT_PART(line, ',', 1)::INT AS x,
-        SPLIT_PART(line, ',', 2)::INT AS y,
-        SPLIT_PART(line, ',', 3)::INT AS z
-    FROM day8_input
-    WHERE line != ''
-),
-
-num_points AS (SELECT COUNT(*)::INT AS n FROM points),
-
--- all pairwise distances
-pairs AS (
-    SELECT
-        p1.id AS i, p2.id AS j,
-        p1.x AS xi, p2.x AS xj,
-        ((p1.x - p2.x)::BIGINT * (p1.x - p2.x) +
-         (p1.y - p2.y)::BIGINT * (p1.y - p2.y) +
-         (p1.z - p2.z)::BIGINT * (p1.z - p2.z)) AS dist_sq
-    FROM points p1
-    JOIN points p2 ON p1.id < p2.id
-),
-
--- Part 1: first 1000 pairs for Union-Find
-ranked_pairs_p1 AS (
-    SELECT i, j, ROW_NUMBER() OVER (ORDER BY dist_sq, i, j) AS rn
-    FROM pairs
-),
-
-top_pairs AS (
-    SELECT i, j, rn FROM ranked_pairs_p1 WHERE rn <= 1000
-),
-
-union_find AS (
-    SELECT
-        0 AS step,
-        ARRAY_AGG(id ORDER BY id) AS comp
-    FROM points
-
-    UNION ALL
-
-    SELECT
-        uf.step + 1,
-        (
-            SELECT ARRAY_AGG(
-                CASE WHEN c = comp_j THEN comp_i ELSE c END
-                ORDER BY idx
-            )
-            FROM unnest(uf.comp) WITH ORDINALITY AS t(c, idx)
-            CROSS JOIN (
-                SELECT uf.comp[tp.i] AS comp_i, uf.comp[tp.j] AS comp_j
-                FROM top_pairs tp WHERE tp.rn = uf.step + 1
-            ) AS pair_comps
+-- Part 1 only needs the 1000 closest pairs, which Postgres finds with a
+-- bounded top-N sort instead of ranking every pair, then runs them through a
+-- union-find (union by size, path halving), so each connection only touches
+-- the two components it merges.
+--
+-- Part 2: assuming the heaviest edge of the minimum spanning tree is unique
+-- (true of the puzzle inputs), it is the last pair Kruskal connects, so we
+-- run dense Prim's algorithm. We keep, for every node outside the tree, its
+-- best distance to the tree; each step picks the closest node and relaxes the
+-- others against it. That is O(n^2) overall and never builds the full pair
+-- list. When several tree edges tie for heaviest, Prim reports the first it
+-- adds, which need not be the pair solution_part2.py connects last.
+
+CREATE OR REPLACE FUNCTION day8_circuits() RETURNS TABLE (part TEXT, answer BIGINT) AS $$
+DECLARE
+    n INT;
+    xs BIGINT[];
+    ys BIGINT[];
+    zs BIGINT[];
+
+    -- union-find over point indexes 1..n
+    parent INT[];
+    size INT[];
+    pair RECORD;
+    a INT;
+    b INT;
+    tmp INT;
+    top_sizes INT[];
+
+    -- Prim's state
+    best BIGINT[];       -- squared distance from each node to the tree
+    best_from INT[];     -- tree node that distance is measured to
+    in_tree BOOLEAN[];
+    node INT := 1;
+    next_node INT;
+    next_dist BIGINT;
+    d BIGINT;
+    heaviest BIGINT := -1;
+    heaviest_x BIGINT := 0;
+BEGIN
+    -- coordinates (pre-parsed by generate_data_sql.py), indexed 1..n in line order
+    SELECT COUNT(*)::INT,
+           ARRAY_AGG(x::BIGINT ORDER BY id),
+           ARRAY_AGG(y::BIGINT ORDER BY id),
+           ARRAY_AGG(z::BIGINT ORDER BY id)
+    INTO n, xs, ys, zs
+    FROM day8_points;
+
+    -- Part 1: the 1000 closest pairs, ties broken by index like the Python
+    parent := ARRAY(SELECT generate_series(1, n));
+    size := array_fill(1, ARRAY[n]);
+
+    FOR pair IN
+        WITH pts AS (
+            SELECT ROW_NUMBER() OVER (ORDER BY id)::INT AS idx, x, y, z FROM day8_points
         )
-    FROM union_find uf
-    WHERE uf.step < 1000
-),
-
-part1_state AS (SELECT comp FROM union_find WHERE step = 1000),
-
-part1_sizes AS (
-    SELECT c, COUNT(*) AS size
-    FROM part1_state, unnest(comp) AS c
-    GROUP BY c
-),
-
-part1_top3 AS (SELECT size FROM part1_sizes ORDER BY size DESC LIMIT 3),
-
--- Part 2: Prim's algorithm - much faster, only n-1 iterations
--- Start from node 1, greedily add closest edge to non-tree node
-prim AS (
-    SELECT
-        1 AS tree_size,
-        ARRAY[1::INT] AS in_tree,
-        0 AS last_xi,
-        0 AS last_xj
-
+        SELECT p1.idx AS i, p2.idx AS j
+        FROM pts p1
+        JOIN pts p2 ON p1.idx < p2.idx
+        ORDER BY (p1.x - p2.x)::BIGINT * (p1.x - p2.x) +
+                 (p1.y - p2.y)::BIGINT * (p1.y - p2.y) +
+                 (p1.z - p2.z)::BIGINT * (p1.z - p2.z),
+                 p1.idx, p2.idx
+        LIMIT 1000
+    LOOP
+        a := pair.i;
+        WHILE parent[a] <> a LOOP
+            parent[a] := parent[parent[a]];
+            a := parent[a];
+        END LOOP;
+        b := pair.j;
+        WHILE parent[b] <> b LOOP
+            parent[b] := parent[parent[b]];
+            b := parent[b];
+        END LOOP;
+
+        IF a <> b THEN
+            IF size[a] < size[b] THEN
+                tmp := a;
+                a := b;
+                b := tmp;
+            END IF;
+            parent[b] := a;
+            size[a] := size[a] + size[b];
+        END IF;
+    END LOOP;
+
+    top_sizes := ARRAY(
+        SELECT size[g] FROM generate_subscripts(parent, 1) AS g
+        WHERE parent[g] = g
+        ORDER BY size[g] DESC
+        LIMIT 3
+    );
+
+    -- Part 2: dense Prim's from node 1
+    best := array_fill(9223372036854775807::BIGINT, ARRAY[n]);
+    best_from := array_fill(0, ARRAY[n]);
+    in_tree := array_fill(FALSE, ARRAY[n]);
+    in_tree[node] := TRUE;
+
+    FOR step IN 1..n - 1 LOOP
+        next_node := 0;
+        next_dist := 9223372036854775807;
+        FOR k IN 1..n LOOP
+            IF NOT in_tree[k] THEN
+                -- relax against the node added last
+                d := (xs[k] - xs[node]) * (xs[k] - xs[node]) +
+                     (ys[k] - ys[node]) * (ys[k] - ys[node]) +
+                     (zs[k] - zs[node]) * (zs[k] - zs[node]);
+                IF d < best[k] THEN
+                    best[k] := d;
+                    best_from[k] := node;
+                END IF;
+                IF best[k] < next_dist THEN
+                    next_dist := best[k];
+                    next_node := k;
+                END IF;
+            END IF;
+        END LOOP;
+
+        in_tree[next_node] := TRUE;
+        IF next_dist > heaviest THEN
+            heaviest := next_dist;
+            heaviest_x := xs[next_node] * xs[best_from[next_node]];
+        END IF;
+        node := next_node;
+    END LOOP;
+
+    RETURN QUERY
+    SELECT 'Part 1'::TEXT, top_sizes[1]::BIGINT * top_sizes[2] * top_sizes[3]
     UNION ALL
+    SELECT 'Part 2'::TEXT, heaviest_x;
+END;
+$$ LANGUAGE plpgsql;
 
-    SELECT
-        p.tree_size + 1,
-        p.in_tree || best.new_node,
-        best.xi,
-        best.xj
-    FROM prim p
-    CROSS JOIN LATERAL (
-        SELECT
-            CASE WHEN pr.i = ANY(p.in_tree) THEN pr.j ELSE pr.i END AS new_node,
-            CASE WHEN pr.i = ANY(p.in_tree) THEN pr.xj ELSE pr.xi END AS xi,
-            CASE WHEN pr.i = ANY(p.in_tree) THEN pr.xi ELSE pr.xj END AS xj
-        FROM pairs pr
-        WHERE (pr.i = ANY(p.in_tree) AND NOT pr.j = ANY(p.in_tree))
-           OR (NOT pr.i = ANY(p.in_tree) AND pr.j = ANY(p.in_tree))
-        ORDER BY pr.dist_sq
-        LIMIT 1
-    ) AS best
-    WHERE p.tree_size < (SELECT n FROM num_points)
-)
-
-SELECT 'Part 1' AS part,
-       (SELECT size FROM part1_top3 OFFSET 0 LIMIT 1) *
-       (SELECT size FROM part1_top3 OFFSET 1 LIMIT 1) *
-       (SELECT size FROM part1_top3 OFFSET 2 LIMIT 1) AS answer
-UNION ALL
-SELECT 'Part 2' AS part,
-       (SELECT last_xi::BIGINT * last_xj FROM prim
-        WHERE tree_size = (SELECT n FROM num_points)) AS answer;
+SELECT part, answer FROM day8_circuits();
@@ -8,6 +8,11 @@ Part 2: Rectangle must be entirely within the polygon (red+green tiles only).
 
 from itertools import combinations
 
+try:
+    import parse_cache
+except ImportError:
+    parse_cache = None
+
 def solve_part1(vertices):
     max_area = 0
     for (x1, y1), (x2, y2) in combinations(vertices, 2):
@@ -126,7 +131,8 @@ def solve_part2(vertices):
 
     return max_area
 
-def solve(input_path):
+def read_vertices(input_path):
+    """(x, y) polygon vertices in order."""
     with open(input_path) as f:
         lines = f.read().strip().split('\n')
 
@@ -134,6 +140,15 @@ def solve(input_path):
     for line in lines:
         x, y = map(int, line.split(','))
         vertices.append((x, y))
+    return vertices
+
+def parse_input(input_path):
+    if parse_cache is None:
+        return read_vertices(input_path)
+    return parse_cache.load(input_path, "day9-vertices", read_vertices)
+
+def solve(input_path):
+    vertices = parse_input(input_path)
 
     part1 = solve_part1(vertices)
     part2 = solve_part2(vertices)
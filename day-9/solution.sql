@@ -2,148 +2,136 @@
 --
 -- Part 1: Find largest rectangle using two red tiles as opposite corners.
 -- Part 2: Rectangle must be entirely within the polygon (red+green tiles).
-
-WITH RECURSIVE
-
--- Parse red tile coordinates (vertices of polygon)
-vertices AS (
-    SELECT
-        line_num AS id,
-        SPLIT_PART(line, ',', 1)::BIGINT AS x,
-        SPLIT_PART(line, ',', 2)::BIGINT AS y
-    FROM day9_input
-    WHERE line != ''
-),
-
-n_vertices AS (SELECT COUNT(*) AS n FROM vertices),
+--
+-- For part 2 only the "critical" coordinates matter (the distinct x and y
+-- values of the vertices): a rectangle is inside the polygon when every
+-- critical point within it is inside or on the boundary. So we compress the
+-- plane to those coordinates, decide inside/outside once per compressed
+-- point, and keep a 2D prefix sum of the outside points in an indexed table.
+-- Any rectangle is then checked with four lookups, and we check them from
+-- the largest area down, stopping at the first one that fits.
+
+-- Compressed coordinates of every vertex (pre-parsed by generate_data_sql.py)
+DROP TABLE IF EXISTS d9_corners;
+CREATE TEMP TABLE d9_corners AS
+SELECT
+    v.id, v.x, v.y,
+    DENSE_RANK() OVER (ORDER BY v.x)::INT AS xi,
+    DENSE_RANK() OVER (ORDER BY v.y)::INT AS yi
+FROM day9_vertices v;
+
+-- outside[xi][yi] summed over everything at or below-left of (xi, yi)
+DROP TABLE IF EXISTS d9_prefix;
+CREATE TEMP TABLE d9_prefix AS
+WITH
+
+xs AS (SELECT DISTINCT x, xi FROM d9_corners),
+ys AS (SELECT DISTINCT y, yi FROM d9_corners),
 
 -- Build edges: connect consecutive vertices (wrapping around)
 edges AS (
     SELECT
-        v1.id AS edge_id,
-        v1.x AS x1, v1.y AS y1,
-        v2.x AS x2, v2.y AS y2,
-        CASE WHEN v1.y = v2.y THEN 'H' ELSE 'V' END AS edge_type
-    FROM vertices v1
-    JOIN vertices v2 ON v2.id = CASE
-        WHEN v1.id = (SELECT n FROM n_vertices) THEN 1
-        ELSE v1.id + 1
+        LEAST(c1.x, c2.x) AS x_min, GREATEST(c1.x, c2.x) AS x_max,
+        LEAST(c1.y, c2.y) AS y_min, GREATEST(c1.y, c2.y) AS y_max,
+        c1.xi, c1.yi,
+        c1.x = c2.x AS vertical
+    FROM d9_corners c1
+    JOIN d9_corners c2 ON c2.id = CASE
+        WHEN c1.id = (SELECT MAX(id) FROM d9_corners) THEN 1
+        ELSE c1.id + 1
     END
 ),
 
--- Vertical edges for ray casting (x, y_min, y_max)
-vert_edges AS (
-    SELECT x1 AS x,
-           LEAST(y1, y2) AS y_min,
-           GREATEST(y1, y2) AS y_max
-    FROM edges
-    WHERE edge_type = 'V'
+-- compressed points on the boundary: along a vertical edge's column or a
+-- horizontal edge's row
+boundary AS (
+    SELECT e.xi, ys.yi
+    FROM edges e
+    JOIN ys ON ys.y BETWEEN e.y_min AND e.y_max
+    WHERE e.vertical
+    UNION
+    SELECT xs.xi, e.yi
+    FROM edges e
+    JOIN xs ON xs.x BETWEEN e.x_min AND e.x_max
+    WHERE NOT e.vertical
 ),
 
--- Horizontal edges for boundary check (y, x_min, x_max)
-horiz_edges AS (
-    SELECT y1 AS y,
-           LEAST(x1, x2) AS x_min,
-           GREATEST(x1, x2) AS x_max
-    FROM edges
-    WHERE edge_type = 'H'
+-- vertical edges a rightward ray along row yi would cross at column xi,
+-- using the same (y_min, y_max] half-open rule as the Python ray cast
+crossing_here AS (
+    SELECT e.xi, ys.yi, COUNT(*) AS crossings
+    FROM edges e
+    JOIN ys ON ys.y > e.y_min AND ys.y <= e.y_max
+    WHERE e.vertical
+    GROUP BY e.xi, ys.yi
 ),
 
--- Critical coordinates
-critical_x AS (SELECT DISTINCT x FROM vertices),
-critical_y AS (SELECT DISTINCT y FROM vertices),
-
--- All critical points
-critical_points AS (
-    SELECT cx.x, cy.y
-    FROM critical_x cx
-    CROSS JOIN critical_y cy
+-- every compressed point with the crossings strictly to its right
+grid AS (
+    SELECT
+        xs.xi, ys.yi,
+        b.xi IS NOT NULL AS on_boundary,
+        COALESCE(SUM(ch.crossings) OVER (
+            PARTITION BY ys.yi ORDER BY xs.xi DESC
+            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+        ), 0) AS crossings_right
+    FROM xs
+    CROSS JOIN ys
+    LEFT JOIN boundary b ON b.xi = xs.xi AND b.yi = ys.yi
+    LEFT JOIN crossing_here ch ON ch.xi = xs.xi AND ch.yi = ys.yi
 ),
 
--- Check if each critical point is on boundary
-on_boundary AS (
-    SELECT DISTINCT cp.x, cp.y
-    FROM critical_points cp
-    WHERE EXISTS (
-        SELECT 1 FROM horiz_edges h
-        WHERE cp.y = h.y AND cp.x >= h.x_min AND cp.x <= h.x_max
-    )
-    OR EXISTS (
-        SELECT 1 FROM vert_edges v
-        WHERE cp.x = v.x AND cp.y >= v.y_min AND cp.y <= v.y_max
-    )
+outside AS (
+    SELECT
+        xi, yi,
+        CASE WHEN on_boundary OR crossings_right % 2 = 1 THEN 0 ELSE 1 END AS outside
+    FROM grid
 ),
 
--- Count ray crossings for each critical point (vertical edges to the right)
-ray_crossings AS (
-    SELECT cp.x, cp.y,
-           COUNT(*) FILTER (WHERE ve.y_min < cp.y AND cp.y <= ve.y_max) AS crossings
-    FROM critical_points cp
-    LEFT JOIN vert_edges ve ON ve.x > cp.x
-    GROUP BY cp.x, cp.y
-),
+-- prefix sums along each row, then down each column
+row_prefix AS (
+    SELECT xi, yi, SUM(outside) OVER (PARTITION BY yi ORDER BY xi) AS row_sum
+    FROM outside
+)
 
--- Points that are strictly inside (odd crossings)
-inside_points AS (
-    SELECT x, y
-    FROM ray_crossings
-    WHERE crossings % 2 = 1
-),
+SELECT xi, yi, SUM(row_sum) OVER (PARTITION BY xi ORDER BY yi)::INT AS outside_below
+FROM row_prefix;
 
--- Valid points: on boundary OR inside
-valid_points AS (
-    SELECT x, y FROM on_boundary
-    UNION
-    SELECT x, y FROM inside_points
-),
+ALTER TABLE d9_prefix ADD PRIMARY KEY (xi, yi);
+ANALYZE d9_prefix;
 
--- All pairs of vertices with their areas
-vertex_pairs AS (
-    SELECT
-        v1.id AS id1, v2.id AS id2,
-        v1.x AS x1, v1.y AS y1,
-        v2.x AS x2, v2.y AS y2,
-        LEAST(v1.x, v2.x) AS x_min,
-        GREATEST(v1.x, v2.x) AS x_max,
-        LEAST(v1.y, v2.y) AS y_min,
-        GREATEST(v1.y, v2.y) AS y_max,
-        (ABS(v2.x - v1.x) + 1) * (ABS(v2.y - v1.y) + 1) AS area
-    FROM vertices v1
-    JOIN vertices v2 ON v1.id < v2.id
-),
+WITH
 
--- Count critical points in each rectangle
-rect_critical_counts AS (
+-- All pairs of vertices with their areas and compressed bounds
+vertex_pairs AS (
     SELECT
-        vp.id1, vp.id2, vp.area,
-        COUNT(cp.*) AS total_critical,
-        COUNT(valid.*) AS valid_critical
-    FROM vertex_pairs vp
-    LEFT JOIN critical_points cp ON
-        cp.x >= vp.x_min AND cp.x <= vp.x_max AND
-        cp.y >= vp.y_min AND cp.y <= vp.y_max
-    LEFT JOIN valid_points valid ON
-        valid.x = cp.x AND valid.y = cp.y
-    GROUP BY vp.id1, vp.id2, vp.area
-),
-
--- Valid rectangles: all critical points inside are valid
-valid_rects AS (
-    SELECT id1, id2, area
-    FROM rect_critical_counts
-    WHERE total_critical = valid_critical
+        LEAST(c1.xi, c2.xi) AS xi_lo, GREATEST(c1.xi, c2.xi) AS xi_hi,
+        LEAST(c1.yi, c2.yi) AS yi_lo, GREATEST(c1.yi, c2.yi) AS yi_hi,
+        (ABS(c2.x - c1.x) + 1) * (ABS(c2.y - c1.y) + 1) AS area
+    FROM d9_corners c1
+    JOIN d9_corners c2 ON c1.id < c2.id
 ),
 
 part1 AS (
-    SELECT MAX(area) AS answer
-    FROM vertex_pairs
+    SELECT COALESCE(MAX(area), 0) AS answer FROM vertex_pairs
 ),
 
+-- largest first; OFFSET 0 keeps the validity check above the sort, so it
+-- runs lazily in area order and LIMIT 1 stops at the first valid rectangle
 part2 AS (
-    SELECT MAX(area) AS answer
-    FROM valid_rects
+    SELECT area AS answer
+    FROM (SELECT * FROM vertex_pairs ORDER BY area DESC OFFSET 0) ranked
+    WHERE (SELECT outside_below FROM d9_prefix WHERE xi = ranked.xi_hi AND yi = ranked.yi_hi)
+        - COALESCE((SELECT outside_below FROM d9_prefix
+                    WHERE xi = ranked.xi_lo - 1 AND yi = ranked.yi_hi), 0)
+        - COALESCE((SELECT outside_below FROM d9_prefix
+                    WHERE xi = ranked.xi_hi AND yi = ranked.yi_lo - 1), 0)
+        + COALESCE((SELECT outside_below FROM d9_prefix
+                    WHERE xi = ranked.xi_lo - 1 AND yi = ranked.yi_lo - 1), 0) = 0
+    LIMIT 1
 )
 
 SELECT 'Part 1' AS part, answer FROM part1
 UNION ALL
-SELECT 'Part 2' AS part, answer FROM part2;
+-- 0 when no rectangle fits, as the Python solver answers
+SELECT 'Part 2' AS part, COALESCE((SELECT answer FROM part2), 0) AS answer;
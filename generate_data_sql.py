@@ -2,52 +2,391 @@
 """
 Generate load_data.sql from all day input files.
 Creates tables: day1_input, day2_input, etc.
+
+Each table is loaded with a COPY ... FROM STDIN block, written to the output
+file one line at a time, so neither this script nor Postgres ever holds a
+whole input in a single statement.
+
+Alongside each raw dayN_input table, days with a known format also get typed,
+indexed tables holding the already-parsed input (see TYPED_TABLES), loaded the
+same way, so SQL solutions can join against them instead of re-parsing text.
+
+Generation is incremental. Every day-N directory with an input file gets its
+own data_sql/dayN_input.sql, regenerated only when the input's content hash
+(recorded in data_sql/manifest.json) changes. Each per-day file also records
+its hash in the input_manifest table, so `--stale` can tell which files still
+need loading into an existing database. load_data.sql is the concatenation of
+the per-day files and is used to initialise a fresh database.
+
+Usage:
+    python3 generate_data_sql.py            # regenerate what changed
+    python3 generate_data_sql.py --force    # regenerate everything
+    psql -At -F' ' -c "SELECT day, sha256 FROM input_manifest" \\
+        | python3 generate_data_sql.py --stale   # per-day files to (re)load
 """
 
+import argparse
+import hashlib
+import json
 import os
+import re
+import sys
 
-def escape_sql(s):
-    """Escape single quotes for SQL string literals."""
-    return s.replace("'", "''")
+# Bump when the generated SQL changes shape, so every day is regenerated
+SQL_FORMAT_VERSION = 2
 
-def generate_day_sql(day_num, input_path):
-    """Generate SQL for a single day's input."""
-    table_name = f"day{day_num}_input"
+SQL_DIR = "data_sql"
+MANIFEST_NAME = "manifest.json"
+
+# COPY text format: backslash, tab, newline and carriage return must be escaped
+COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+})
 
-    lines = []
-    lines.append(f"-- Day {day_num}")
-    lines.append(f"DROP TABLE IF EXISTS {table_name};")
-    lines.append(f"CREATE TABLE {table_name} (line_num INTEGER PRIMARY KEY, line TEXT);")
+def escape_copy(s):
+    """Escape a value for the COPY text format."""
+    return s.translate(COPY_ESCAPES)
 
+def discover_days(script_dir):
+    """Find every day-N directory with an input file, as (day, input_path)."""
+    days = []
+    for name in os.listdir(script_dir):
+        match = re.fullmatch(r'day-(\d+)', name)
+        input_path = os.path.join(script_dir, name, "input")
+        if match and os.path.isfile(input_path):
+            days.append((int(match.group(1)), input_path))
+    return sorted(days)
+
+def input_hash(input_path):
+    """Content hash of an input file, salted with the SQL format version."""
+    digest = hashlib.sha256(f"v{SQL_FORMAT_VERSION}\n".encode())
+    with open(input_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def numbered_lines(input_path):
+    """Yield (line_num, line) as loaded into dayN_input.
+
+    Blank lines are kept (several inputs use them as separators), except
+    trailing ones at the end of the file.
+    """
+    line_num = 0
+    pending_blank = 0
     with open(input_path, 'r') as f:
-        data_lines = f.read().rstrip('\n').split('\n')
+        for line in f:
+            line = line.rstrip('\n')
+            if not line:
+                pending_blank += 1
+                continue
+            for _ in range(pending_blank):
+                line_num += 1
+                yield line_num, ''
+            pending_blank = 0
+            line_num += 1
+            yield line_num, line
 
-    if data_lines:
-        lines.append(f"INSERT INTO {table_name} (line_num, line) VALUES")
-        values = []
-        for i, line in enumerate(data_lines, 1):
-            escaped = escape_sql(line)
-            values.append(f"  ({i}, '{escaped}')")
-        lines.append(",\n".join(values) + ";")
+# Typed tables: row generators take numbered_lines() and yield tuples.
+# Rows and columns follow the raw table: row = line_num, col is 1-based.
 
-    return "\n".join(lines)
+def rotations_rows(lines):
+    for line_num, line in lines:
+        if line:
+            distance = int(line[1:])
+            yield line_num, line[0], distance, -distance if line[0] == 'L' else distance
+
+def id_ranges_rows(lines):
+    range_id = 0
+    for _, line in lines:
+        for part in line.split(','):
+            if '-' in part:
+                range_id += 1
+                start, end = part.split('-')
+                yield range_id, int(start), int(end)
+
+def bank_digits_rows(lines):
+    for line_num, line in lines:
+        digits = [c for c in line if c.isdigit()]
+        for pos, digit in enumerate(digits, 1):
+            yield line_num, pos, int(digit)
+
+def char_cells_rows(lines, skip):
+    for line_num, line in lines:
+        for col, ch in enumerate(line, 1):
+            if ch not in skip:
+                yield line_num, col, ch
+
+def roll_cells_rows(lines):
+    for row, col, _ in char_cells_rows(lines, skip='.'):
+        yield row, col
+
+def fresh_ranges_rows(lines):
+    range_id = 0
+    for _, line in lines:
+        if not line.strip():
+            break
+        range_id += 1
+        start, end = line.split('-')
+        yield range_id, int(start), int(end)
+
+def ingredient_rows(lines):
+    in_ids = False
+    for line_num, line in lines:
+        if not line.strip():
+            in_ids = True
+        elif in_ids:
+            yield line_num, int(line)
+
+def coordinate_rows(lines):
+    for line_num, line in lines:
+        if line:
+            yield (line_num, *map(int, line.split(',')))
+
+def machine_rows(lines):
+    for line_num, line in lines:
+        if line:
+            target = line[line.index('[') + 1:line.index(']')]
+            target_bits = sum(1 << i for i, c in enumerate(target) if c == '#')
+            yield line_num, target, target_bits
+
+def button_rows(lines):
+    for line_num, line in lines:
+        for button_idx, button in enumerate(re.findall(r'\(([0-9,]+)\)', line)):
+            for counter in button.split(','):
+                yield line_num, button_idx, int(counter)
+
+def joltage_rows(lines):
+    for line_num, line in lines:
+        match = re.search(r'\{([0-9,]+)\}', line)
+        if match:
+            for counter, target in enumerate(match.group(1).split(',')):
+                yield line_num, counter, int(target)
+
+def edge_rows(lines):
+    for _, line in lines:
+        if ': ' in line:
+            src, dsts = line.split(': ', 1)
+            for dst in dsts.split():
+                yield src, dst
+
+def shape_cells_rows(lines):
+    shape_idx = None
+    row = 0
+    for _, line in lines:
+        if re.fullmatch(r'\d+:', line):
+            shape_idx = int(line[:-1])
+            row = 0
+        elif not line or 'x' in line:
+            shape_idx = None
+        elif shape_idx is not None:
+            row += 1
+            for col, ch in enumerate(line, 1):
+                if ch == '#':
+                    yield shape_idx, row, col
+
+def region_rows(lines):
+    for line_num, line in lines:
+        match = re.fullmatch(r'(\d+)x(\d+): ([\d ]+)', line)
+        if match:
+            yield line_num, int(match.group(1)), int(match.group(2))
+
+def region_count_rows(lines):
+    for line_num, line in lines:
+        match = re.fullmatch(r'(\d+)x(\d+): ([\d ]+)', line)
+        if match:
+            for shape_idx, count in enumerate(match.group(3).split()):
+                yield line_num, shape_idx, int(count)
+
+# day -> [(table, "name TYPE, ..." columns, primary key, extra indexes, row generator)]
+TYPED_TABLES = {
+    1: [("day1_rotations",
+         "line_num INTEGER, direction CHAR(1), distance INTEGER, signed_distance INTEGER",
+         "line_num", [], rotations_rows)],
+    2: [("day2_ranges",
+         "id INTEGER, range_start BIGINT, range_end BIGINT",
+         "id", ["range_start, range_end"], id_ranges_rows)],
+    3: [("day3_digits",
+         "bank_id INTEGER, pos INTEGER, digit INTEGER",
+         "bank_id, pos", [], bank_digits_rows)],
+    4: [("day4_cells",
+         "row INTEGER, col INTEGER",
+         "row, col", [], roll_cells_rows)],
+    5: [("day5_ranges",
+         "id INTEGER, range_start BIGINT, range_end BIGINT",
+         "id", ["range_start, range_end"], fresh_ranges_rows),
+        ("day5_ingredients",
+         "line_num INTEGER, id BIGINT",
+         "line_num", ["id"], ingredient_rows)],
+    6: [("day6_chars",
+         "row INTEGER, col INTEGER, ch CHAR(1)",
+         "row, col", ["col"], lambda lines: char_cells_rows(lines, skip=' '))],
+    7: [("day7_cells",
+         "row INTEGER, col INTEGER, ch CHAR(1)",
+         "row, col", [], lambda lines: char_cells_rows(lines, skip='.'))],
+    8: [("day8_points",
+         "id INTEGER, x INTEGER, y INTEGER, z INTEGER",
+         "id", [], coordinate_rows)],
+    9: [("day9_vertices",
+         "id INTEGER, x BIGINT, y BIGINT",
+         "id", ["x", "y"], coordinate_rows)],
+    10: [("day10_machines",
+          "machine_id INTEGER, target TEXT, target_bits BIGINT",
+          "machine_id", [], machine_rows),
+         ("day10_buttons",
+          "machine_id INTEGER, button_idx INTEGER, counter INTEGER",
+          "machine_id, button_idx, counter", [], button_rows),
+         ("day10_joltage",
+          "machine_id INTEGER, counter INTEGER, target INTEGER",
+          "machine_id, counter", [], joltage_rows)],
+    11: [("day11_edges",
+          "src TEXT, dst TEXT",
+          None, ["src", "dst"], edge_rows)],
+    12: [("day12_shape_cells",
+          "shape_idx INTEGER, row INTEGER, col INTEGER",
+          "shape_idx, row, col", [], shape_cells_rows),
+         ("day12_regions",
+          "region_id INTEGER, width INTEGER, height INTEGER",
+          "region_id", [], region_rows),
+         ("day12_region_counts",
+          "region_id INTEGER, shape_idx INTEGER, count INTEGER",
+          "region_id, shape_idx", [], region_count_rows)],
+}
+
+def write_copy(out, table_name, columns, rows):
+    """Write a COPY ... FROM STDIN block for rows (tuples of values)."""
+    out.write(f"COPY {table_name} ({columns}) FROM STDIN;\n")
+    for row in rows:
+        out.write("\t".join(escape_copy(str(value)) for value in row))
+        out.write("\n")
+    out.write("\\.\n")
+
+def generate_day_sql(day_num, input_path, out, content_hash=None):
+    """Write the SQL for a single day's input to the file object out."""
+    table_name = f"day{day_num}_input"
+
+    out.write(f"-- Day {day_num}\n")
+    out.write("BEGIN;\n")
+    out.write(f"DROP TABLE IF EXISTS {table_name};\n")
+    out.write(f"CREATE TABLE {table_name} (line_num INTEGER PRIMARY KEY, line TEXT);\n")
+    write_copy(out, table_name, "line_num, line", numbered_lines(input_path))
+
+    for typed_name, column_defs, primary_key, indexes, rows_fn in TYPED_TABLES.get(day_num, []):
+        columns = ", ".join(col.split()[0] for col in column_defs.split(", "))
+        out.write(f"DROP TABLE IF EXISTS {typed_name};\n")
+        out.write(f"CREATE TABLE {typed_name} ({column_defs});\n")
+        write_copy(out, typed_name, columns, rows_fn(numbered_lines(input_path)))
+        # Indexes are built after loading, which is cheaper than maintaining them
+        if primary_key:
+            out.write(f"ALTER TABLE {typed_name} ADD PRIMARY KEY ({primary_key});\n")
+        for index_cols in indexes:
+            out.write(f"CREATE INDEX ON {typed_name} ({index_cols});\n")
+        out.write(f"ANALYZE {typed_name};\n")
+
+    if content_hash is not None:
+        out.write("CREATE TABLE IF NOT EXISTS input_manifest "
+                  "(day INTEGER PRIMARY KEY, sha256 TEXT NOT NULL);\n")
+        out.write(f"INSERT INTO input_manifest (day, sha256) VALUES ({day_num}, '{content_hash}')\n"
+                  "    ON CONFLICT (day) DO UPDATE SET sha256 = EXCLUDED.sha256;\n")
+    out.write("COMMIT;\n")
+
+def load_manifest(sql_dir):
+    path = os.path.join(sql_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {int(day): sha for day, sha in json.load(f).items()}
+
+def save_manifest(sql_dir, manifest):
+    path = os.path.join(sql_dir, MANIFEST_NAME)
+    with open(path + ".tmp", 'w') as f:
+        json.dump({str(day): sha for day, sha in sorted(manifest.items())}, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def day_sql_path(sql_dir, day_num):
+    return os.path.join(sql_dir, f"day{day_num}_input.sql")
+
+def regenerate(script_dir, force=False):
+    """Regenerate per-day SQL for changed inputs. Returns the changed days."""
+    sql_dir = os.path.join(script_dir, SQL_DIR)
+    os.makedirs(sql_dir, exist_ok=True)
+    manifest = load_manifest(sql_dir)
+    days = discover_days(script_dir)
+
+    changed = []
+    for day_num, input_path in days:
+        content_hash = input_hash(input_path)
+        sql_path = day_sql_path(sql_dir, day_num)
+        if not force and manifest.get(day_num) == content_hash and os.path.exists(sql_path):
+            continue
+        with open(sql_path + ".tmp", 'w') as out:
+            generate_day_sql(day_num, input_path, out, content_hash)
+        os.replace(sql_path + ".tmp", sql_path)
+        manifest[day_num] = content_hash
+        changed.append(day_num)
+
+    # Forget days whose directory or input has gone away
+    present = {day_num for day_num, _ in days}
+    removed = [day_num for day_num in manifest if day_num not in present]
+    for day_num in removed:
+        del manifest[day_num]
+        if os.path.exists(day_sql_path(sql_dir, day_num)):
+            os.remove(day_sql_path(sql_dir, day_num))
+
+    save_manifest(sql_dir, manifest)
 
-def main():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
     output_path = os.path.join(script_dir, "load_data.sql")
+    if changed or removed or not os.path.exists(output_path):
+        with open(output_path, 'w') as out:
+            out.write("-- Auto-generated by generate_data_sql.py\n")
+            out.write("-- Run: psql -d aoc < load_data.sql\n\n")
+            for day_num, _ in days:
+                with open(day_sql_path(sql_dir, day_num)) as day_sql:
+                    for line in day_sql:
+                        out.write(line)
+                out.write("\n")
 
-    all_sql = ["-- Auto-generated by generate_data_sql.py", "-- Run: psql -d aoc < load_data.sql", ""]
+    return changed
 
-    for day in range(1, 13):
-        input_path = os.path.join(script_dir, f"day-{day}", "input")
-        if os.path.exists(input_path):
-            all_sql.append(generate_day_sql(day, input_path))
-            all_sql.append("")
+def stale_files(script_dir, loaded):
+    """Per-day SQL files whose hash differs from what the database has loaded.
+
+    loaded maps day number to the sha256 recorded in input_manifest.
+    """
+    sql_dir = os.path.join(script_dir, SQL_DIR)
+    manifest = load_manifest(sql_dir)
+    return [day_sql_path(sql_dir, day_num)
+            for day_num, content_hash in sorted(manifest.items())
+            if loaded.get(day_num) != content_hash]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--force', action='store_true',
+                        help="regenerate every day, even if its input is unchanged")
+    parser.add_argument('--stale', action='store_true',
+                        help="read 'day sha256' lines loaded in the database from "
+                             "stdin and print the per-day SQL files to (re)load")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
 
-    with open(output_path, 'w') as f:
-        f.write("\n".join(all_sql))
+    if args.stale:
+        loaded = {}
+        for line in sys.stdin:
+            parts = line.split()
+            if len(parts) == 2 and parts[0].isdigit():
+                loaded[int(parts[0])] = parts[1]
+        for path in stale_files(script_dir, loaded):
+            print(path)
+        return
 
-    print(f"Generated {output_path}")
+    changed = regenerate(script_dir, force=args.force)
+    if changed:
+        print(f"Regenerated days: {', '.join(map(str, changed))}")
+    else:
+        print("All day inputs unchanged")
 
 if __name__ == "__main__":
     main()
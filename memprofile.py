@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Peak memory and allocation sites of each day, phase by phase.
+
+Each day is split into phases (parse, part1, part2 where the solver exposes
+them, otherwise one phase per solver call) and measured twice:
+
+  untraced  each phase in a fresh process, with the phases before it run
+            first to build its input. Its wall time, RSS at the start and
+            peak RSS (the kernel's high-water mark, reset before the phase
+            where Linux allows) are what a batch job would see.
+  traced    all phases in this process under tracemalloc, which reports the
+            traced peak, what each phase retains, and the top allocation
+            sites as they stood at the phase's peak (a sampler thread
+            snapshots at each new high). tracemalloc slows Python down and
+            adds its own memory, so these times are labelled traced and no
+            RSS is taken from this run.
+
+The parse cache is off throughout, so parse phases measure real parsing.
+
+Usage:
+    python3 memprofile.py                        # every day, puzzle inputs
+    python3 memprofile.py --days 8 9 --top 5
+    python3 memprofile.py --days 8 --n 4000 --json mem.json
+    python3 memprofile.py --days 12 --top 0      # untraced numbers only
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import benchmark
+import parse_cache
+import solvers
+import synthetic
+
+MIB = 2 ** 20
+
+def read_rss():
+    """Resident set size of this process in bytes, or None off Linux."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+def reset_peak_rss():
+    """Reset this process's RSS high-water mark; False where unsupported."""
+    try:
+        with open("/proc/self/clear_refs", 'w') as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def peak_rss():
+    """Peak RSS of this process in bytes (since the last reset), or None.
+
+    Prefers Linux's VmHWM: ru_maxrss also keeps the high-water mark of the
+    image before exec, i.e. of the (large) parent that forked us.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+def _generic_phases(day):
+    """One phase per registered solver call, named after the parts it answers."""
+    options = solvers.IN_PROCESS_OPTIONS.get(day, {})
+    phases = []
+    for filename, function, parts in solvers.solver_calls(day):
+        solver = getattr(solvers.load_module(day, filename), function)
+        name = "+".join(f"part{part}" for part, _ in parts)
+        phases.append((name, lambda path, state, solver=solver, kwargs=options.get(function, {}):
+                       solver(path, **kwargs)))
+    return phases
+
+def _day9_phases():
+    mod = solvers.load_module(9, "solution.py")
+
+    def parse(path, state):
+        state["vertices"] = mod.read_vertices(path)
+
+    return [("parse", parse),
+            ("part1", lambda path, state: mod.solve_part1(state["vertices"])),
+            ("part2", lambda path, state: mod.solve_part2(state["vertices"]))]
+
+def _day10_phases():
+    mod = solvers.load_module(10, "solution.py")
+
+    def parse(path, state):
+        state["machines"] = mod.read_machines(path)
+
+    return [("parse", parse),
+            ("part1", lambda path, state: mod.solve_part1(state["machines"])),
+            ("part2", lambda path, state: mod.solve_part2(state["machines"]))]
+
+def _day11_phases():
+    mod = solvers.load_module(11, "solution.py")
+
+    def parse(path, state):
+        state["graph"] = defaultdict(list, mod.read_graph(path))
+
+    return [("parse", parse),
+            ("part1", lambda path, state: mod.solve_part1(state["graph"])),
+            ("part2", lambda path, state: mod.solve_part2(state["graph"]))]
+
+# Days whose solvers expose a separate parse step
+PHASES = {9: _day9_phases, 10: _day10_phases, 11: _day11_phases}
+
+def phases(day):
+    """[(name, fn(path, state))] for a day; state carries parsed data along."""
+    return PHASES[day]() if day in PHASES else _generic_phases(day)
+
+def run_untraced_phase(day, path, index):
+    """In this process: run the phases before index, then measure phase index."""
+    day_phases = phases(day)
+    state = {}
+    for _, run in day_phases[:index]:
+        run(path, state)
+    gc.collect()
+    reset = reset_peak_rss()
+    rss_start = read_rss()
+    start = time.perf_counter()
+    day_phases[index][1](path, state)
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "rss_start_bytes": rss_start,
+            "rss_peak_bytes": peak_rss(), "peak_reset": reset}
+
+def measure_untraced(day, path):
+    """Untraced measurements of each phase, one fresh process per phase."""
+    env = dict(os.environ, AOC_NO_PARSE_CACHE="1")
+    results = []
+    for index, (name, _) in enumerate(phases(day)):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--untraced-phase",
+                               str(day), str(index), path],
+                              capture_output=True, text=True, env=env, check=True)
+        results.append(dict(json.loads(proc.stdout.splitlines()[-1]), phase=name))
+    return results
+
+class Sampler(threading.Thread):
+    """Snapshots tracemalloc at each new traced-memory high."""
+
+    def __init__(self, interval=0.01, growth=1.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.growth = growth
+        self.stop_event = threading.Event()
+        self.snapshot = None
+        self.snapshot_size = 0
+
+    def sample(self):
+        current = tracemalloc.get_traced_memory()[0]
+        if current > self.snapshot_size * self.growth:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+        self.sample()
+
+_IGNORE = [tracemalloc.Filter(False, tracemalloc.__file__),
+           tracemalloc.Filter(False, threading.__file__),
+           tracemalloc.Filter(False, "*/_weakrefset.py"),
+           tracemalloc.Filter(False, __file__)]
+
+def top_sites(snapshot, baseline, limit):
+    """Largest allocation sites in snapshot that were not there at baseline."""
+    if snapshot is None or limit <= 0:
+        return []
+    stats = snapshot.filter_traces(_IGNORE).compare_to(baseline.filter_traces(_IGNORE), 'lineno')
+    sites = []
+    for stat in stats:
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        sites.append({"site": f"{os.path.relpath(frame.filename, solvers.ROOT)}:{frame.lineno}",
+                      "bytes": stat.size_diff, "blocks": stat.count_diff})
+        if len(sites) == limit:
+            break
+    return sites
+
+def measure_traced(day, path, top=10, interval=0.01):
+    """Run a day's phases in this process under tracemalloc."""
+    results = []
+    state = {}
+    day_phases = phases(day)  # import the solvers before tracing starts
+    tracemalloc.start()
+    try:
+        for name, run in day_phases:
+            baseline = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            sampler = Sampler(interval)
+            sampler.start()
+            start = time.perf_counter()
+            try:
+                run(path, state)
+            finally:
+                seconds = time.perf_counter() - start
+                sampler.stop()
+            current, peak = tracemalloc.get_traced_memory()
+            results.append({
+                "phase": name,
+                "traced_seconds": seconds,
+                "traced_peak_bytes": peak,
+                "traced_end_bytes": current,
+                "top_sites": top_sites(sampler.snapshot, baseline, top),
+            })
+    finally:
+        tracemalloc.stop()
+    return results
+
+def profile_day(day, path, top=10, interval=0.01):
+    """Untraced and (unless top is 0) traced measurements; a list of phase dicts."""
+    parse_cache.disable()
+    results = measure_untraced(day, path)
+    if top > 0:
+        for result, traced in zip(results, measure_traced(day, path, top, interval)):
+            result.update(traced)
+    return results
+
+def _mib(value):
+    return "" if value is None else f"{value / MIB:.1f}"
+
+def print_report(day, results):
+    print(f"--- Day {day} ---")
+    print(f"  {'Phase':<12} {'Seconds':>9} {'RSS start MiB':>14} {'RSS peak MiB':>13} "
+          f"{'Traced s':>9} {'Traced peak MiB':>16} {'Retained MiB':>13}")
+    for r in results:
+        traced_seconds = f"{r['traced_seconds']:.3f}" if "traced_seconds" in r else ""
+        peak = _mib(r['rss_peak_bytes']) + ("" if r["peak_reset"] else "*")
+        print(f"  {r['phase']:<12} {r['seconds']:>9.3f} {_mib(r['rss_start_bytes']):>14} "
+              f"{peak:>13} {traced_seconds:>9} {_mib(r.get('traced_peak_bytes')):>16} "
+              f"{_mib(r.get('traced_end_bytes')):>13}")
+    if not all(r["peak_reset"] for r in results):
+        print("  * peak RSS could not be reset, so it includes the phases before")
+    for r in results:
+        if r.get("top_sites"):
+            print(f"  Top allocation sites at the {r['phase']} peak (traced):")
+            for site in r["top_sites"]:
+                print(f"    {site['bytes'] / MIB:>8.2f} MiB  {site['blocks']:>9} blocks  "
+                      f"{site['site']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--days', type=int, nargs='+', help="only profile these days")
+    parser.add_argument('--n', type=int, help="profile a synthetic input of this size "
+                                              "instead of day-N/input")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic input seed")
+    parser.add_argument('--top', type=int, default=10,
+                        help="allocation sites per phase (0 skips the traced run)")
+    parser.add_argument('--interval', type=float, default=0.01,
+                        help="snapshot sampling interval in seconds (default 0.01)")
+    parser.add_argument('--json', metavar='PATH', help="also write the results as JSON")
+    parser.add_argument('--untraced-phase', nargs=3, metavar=('DAY', 'INDEX', 'PATH'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.untraced_phase:
+        day, index, path = args.untraced_phase
+        parse_cache.disable()
+        print(json.dumps(run_untraced_phase(int(day), path, int(index))))
+        return
+
+    days = args.days or solvers.available_days()
+    report = {"environment": benchmark.environment(), "n": args.n, "days": {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        for day in days:
+            path = solvers.input_path(day)
+            if args.n is not None:
+                path = synthetic.write_input(os.path.join(workdir, f"day{day}"), day,
+                                             args.n, args.seed)
+            results = profile_day(day, path, args.top, args.interval)
+            report["days"][str(day)] = results
+            print_report(day, results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Binary cache of parsed puzzle inputs, shared by the day solvers.
+
+Solvers with real parsing work (days 9-12) send it through load(): the parsed
+value is marshalled into CACHE_DIR under a name made of the parser's key and
+version, the Python version (marshal's format is version specific) and the
+sha256 of the input's contents. Later runs unmarshal it straight from an mmap
+of that file. Bump a parser's version whenever its output changes shape.
+
+The cache holds at most MAX_ENTRIES files; each write evicts the least
+recently used beyond that (a hit refreshes its entry's mtime). Setting
+AOC_NO_PARSE_CACHE, or calling disable(), bypasses it entirely, for tools
+that time parsing or solve many one-off inputs.
+
+Solvers import this module optionally: run from inside day-N/, where the repo
+root is not on sys.path, they parse directly every time.
+
+Usage:
+    python3 parse_cache.py            # list cached entries
+    python3 parse_cache.py --prune    # evict down to MAX_ENTRIES
+    python3 parse_cache.py --clear
+"""
+
+import argparse
+import hashlib
+import marshal
+import mmap
+import os
+import sys
+import tempfile
+
+CACHE_DIR = os.environ.get("AOC_PARSE_CACHE",
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        ".parse_cache"))
+MAX_ENTRIES = 64
+ENABLED = not os.environ.get("AOC_NO_PARSE_CACHE")
+
+def disable():
+    """Bypass the cache in this process and in processes it starts."""
+    global ENABLED
+    ENABLED = False
+    os.environ["AOC_NO_PARSE_CACHE"] = "1"
+
+def content_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_path(input_path, key, version):
+    py = f"py{sys.version_info[0]}{sys.version_info[1]}"
+    return os.path.join(CACHE_DIR, f"{key}-v{version}-{py}-{content_hash(input_path)[:32]}.marshal")
+
+def _read(path):
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return marshal.loads(data)
+
+def _write(path, value):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            marshal.dump(value, f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def load(input_path, key, parse, version=1):
+    """parse(input_path), served from the cache when the input is unchanged.
+
+    A missing, empty or corrupt entry is reparsed and rewritten; if the cache
+    cannot be written (read-only tree, unmarshallable value) the parsed value
+    is still returned.
+    """
+    if not ENABLED:
+        return parse(input_path)
+    path = cache_path(input_path, key, version)
+    try:
+        value = _read(path)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    else:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    value = parse(input_path)
+    try:
+        _write(path, value)
+        prune()
+    except (OSError, ValueError):
+        pass
+    return value
+
+def entries():
+    """(name, size in bytes) of every cached entry."""
+    if not os.path.isdir(CACHE_DIR):
+        return []
+    return sorted((name, os.path.getsize(os.path.join(CACHE_DIR, name)))
+                  for name in os.listdir(CACHE_DIR) if name.endswith(".marshal"))
+
+def prune(max_entries=None):
+    """Delete the least recently used entries beyond max_entries (default MAX_ENTRIES)."""
+    max_entries = MAX_ENTRIES if max_entries is None else max_entries
+    names = [name for name, _ in entries()]
+    if len(names) <= max_entries:
+        return
+    used = []
+    for name in names:
+        try:
+            used.append((os.path.getmtime(os.path.join(CACHE_DIR, name)), name))
+        except FileNotFoundError:  # evicted by another process meanwhile
+            pass
+    for _, name in sorted(used, reverse=True)[max_entries:]:
+        try:
+            os.unlink(os.path.join(CACHE_DIR, name))
+        except FileNotFoundError:
+            pass
+
+def clear():
+    for name, _ in entries():
+        os.unlink(os.path.join(CACHE_DIR, name))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--clear', action='store_true', help="delete every cached entry")
+    parser.add_argument('--prune', action='store_true',
+                        help=f"evict the least recently used entries beyond {MAX_ENTRIES}")
+    args = parser.parse_args()
+
+    if args.clear:
+        clear()
+        return
+    if args.prune:
+        prune()
+    for name, size in entries():
+        print(f"{size:>10}  {name}")
+
+if __name__ == "__main__":
+    main()
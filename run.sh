@@ -3,14 +3,15 @@ set -e
 
 cd "$(dirname "$0")"
 
-# Generate fresh load_data.sql from input files
+# Regenerate SQL only for inputs that changed since the last run
 echo "Generating load_data.sql..."
 python3 generate_data_sql.py
 
-# Stop and remove existing container (fresh start with new data)
-echo "Starting fresh PostgreSQL container..."
-docker-compose down -v 2>/dev/null || true
-docker-compose up -d
+# Reuse the running container; a fresh one loads load_data.sql on first startup
+if ! docker ps --format '{{.Names}}' | grep -qx aoc_postgres; then
+    echo "Starting PostgreSQL container..."
+    docker-compose up -d
+fi
 
 # Wait for Postgres to be ready
 echo "Waiting for PostgreSQL to be ready..."
@@ -19,18 +20,20 @@ until docker exec aoc_postgres pg_isready -U postgres > /dev/null 2>&1; do
 done
 sleep 2  # Extra wait for init scripts to complete
 
+# Reload only the tables whose input hash differs from what is loaded
+loaded=$(docker exec aoc_postgres psql -U postgres -d aoc -At -F' ' \
+    -c "SELECT day, sha256 FROM input_manifest" 2>/dev/null || true)
+for sql in $(echo "$loaded" | python3 generate_data_sql.py --stale); do
+    echo "Loading $(basename "$sql")..."
+    docker exec -i aoc_postgres psql -q -v ON_ERROR_STOP=1 -U postgres -d aoc < "$sql"
+done
+
 echo ""
 echo "=== Running Solutions ==="
 echo ""
 
-# Run all days that have solutions (auto-detect up to day 25)
-for day in $(seq 1 25); do
-    solution="day-${day}/solution.sql"
-    if [ -f "$solution" ]; then
-        echo "--- Day $day ---"
-        docker exec -i aoc_postgres psql -U postgres -d aoc < "$solution"
-        echo ""
-    fi
-done
+# Run all days that have solutions concurrently, with per-day timing
+# (pass e.g. --explain plans/ to also save EXPLAIN ANALYZE output)
+python3 run_sql.py "$@"
 
 echo "=== Done ==="
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Run the Python solvers for every day and print the answers with timings.
+
+With --cached, answers whose input and solver source are unchanged since
+they were last computed come from the answer cache (answer_cache.py), and
+only the days that changed are solved again. With --profile, each day runs
+under cProfile (or --profile sample, a sampling profiler) and its .pstats and
+collapsed stacks are written to profiles/ (see cpuprofile.py).
+
+Usage:
+    python3 run_python.py                        # all days
+    python3 run_python.py --cached               # reuse unchanged answers
+    python3 run_python.py --days 8 9
+    python3 run_python.py --days 9 --profile     # hot functions of day 9
+"""
+
+import argparse
+import sys
+import time
+
+import answer_cache
+import cpuprofile
+import solvers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--days', type=int, nargs='+', help="only run these days")
+    parser.add_argument('--cached', action='store_true',
+                        help="serve unchanged answers from the answer cache")
+    parser.add_argument('--cache', default=answer_cache.DEFAULT_PATH,
+                        help="answer cache file (default %(default)s)")
+    parser.add_argument('--max-entries', type=int, default=answer_cache.DEFAULT_MAX_ENTRIES,
+                        help="answer cache size bound (default %(default)s)")
+    parser.add_argument('--profile', nargs='?', const="cprofile", choices=cpuprofile.MODES,
+                        help="profile each day (cprofile by default, or sample) and print "
+                             "its hot functions")
+    parser.add_argument('--profile-dir', default=cpuprofile.DEFAULT_DIR,
+                        help="where --profile writes .pstats and .collapsed files")
+    parser.add_argument('--top', type=int, default=20,
+                        help="functions --profile prints per day (default %(default)s)")
+    args = parser.parse_args()
+    if args.profile and args.cached:
+        parser.error("--profile and --cached do not mix: cached days are not run")
+
+    days = args.days or solvers.available_days()
+    cache = answer_cache.AnswerCache(args.cache, args.max_entries) if args.cached else None
+
+    summary = []
+    start = time.perf_counter()
+    for day in days:
+        stats = None
+        if cache is not None:
+            answers, seconds, cached_parts = answer_cache.solve_day_cached(day, cache)
+        elif args.profile:
+            answers, seconds, stats, written = cpuprofile.profile_day(day, mode=args.profile,
+                                                                      out_dir=args.profile_dir)
+            cached_parts = set()
+        else:
+            day_start = time.perf_counter()
+            answers = solvers.solve_day(day)
+            seconds = time.perf_counter() - day_start
+            cached_parts = set()
+
+        status = "cached" if cached_parts and cached_parts == set(answers) else "ran"
+        print(f"--- Day {day} ({seconds:.2f}s, {status}) ---")
+        for part, answer in sorted(answers.items()):
+            print(f"  Part {part}: {answer}{' (cached)' if part in cached_parts else ''}")
+        if stats is not None:
+            cpuprofile.print_top(stats, args.top)
+            print(f"  Wrote {', '.join(written)}")
+        sys.stdout.flush()
+        summary.append((day, seconds, status))
+    total = time.perf_counter() - start
+
+    if cache is not None:
+        cache.save()
+
+    print()
+    print(f"{'Day':>4}  {'Seconds':>8}  Status")
+    for day, seconds, status in summary:
+        print(f"{day:>4}  {seconds:>8.2f}  {status}")
+    print(f"Wall time {total:.2f}s for {len(summary)} days")
+    if cache is not None:
+        print(f"Answer cache: {cache.hits} hits, {cache.misses} misses")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Run the day-N/solution.sql queries concurrently and time each one.
+
+Each day runs in its own psql session; --jobs of them run at once. Against
+the docker-compose container by default, or any Postgres given by --dsn.
+With --explain DIR, the final statement of each solution is run under
+EXPLAIN (ANALYZE, BUFFERS) and the plan is saved to DIR/dayN.txt, which shows
+where the time goes CTE by CTE. Solutions that do their work in PL/pgSQL
+functions (days 4, 8, 10 and 11) would only show a Function Scan that way, so
+they are run whole under auto_explain with nested statements logged, and
+DIR/dayN.txt holds the plan of every statement, inside the functions too.
+That LOADs auto_explain, which needs a superuser (the docker default).
+
+With --cached, days whose loaded input and solution.sql are unchanged since
+their last successful run are served from the answer cache (answer_cache.py)
+instead of being run again. The input is identified by the hash the database
+recorded in input_manifest when it was loaded, so a database that is behind
+day-N/input never caches under the new input's key; such days run uncached
+with a warning.
+
+Usage:
+    python3 run_sql.py                          # all days, docker container
+    python3 run_sql.py --dsn postgresql://localhost/aoc --jobs 8
+    python3 run_sql.py --days 8 9 --explain plans/
+    python3 run_sql.py --cached
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import answer_cache
+import generate_data_sql
+
+DOCKER_PSQL = ["docker", "exec", "-i", "aoc_postgres", "psql", "-U", "postgres", "-d", "aoc"]
+
+def discover_solutions(script_dir, days=None):
+    """Find day-N/solution.sql files, as (day, path) in day order."""
+    solutions = []
+    for name in os.listdir(script_dir):
+        match = re.fullmatch(r'day-(\d+)', name)
+        path = os.path.join(script_dir, name, "solution.sql")
+        if match and os.path.isfile(path):
+            day = int(match.group(1))
+            if days is None or day in days:
+                solutions.append((day, path))
+    return sorted(solutions)
+
+def psql_command(dsn=None):
+    """psql invocation: unaligned, tab-separated, tuples only, stop on error."""
+    base = ["psql", dsn] if dsn else list(DOCKER_PSQL)
+    return base + ["-X", "-q", "-At", "-F", "\t", "-v", "ON_ERROR_STOP=1"]
+
+def split_statements(sql):
+    """Split a SQL script into statements on top-level semicolons.
+
+    Understands -- and /* */ comments, quoted strings and identifiers, and
+    dollar-quoted bodies, so PL/pgSQL functions stay in one piece.
+    """
+    statements = []
+    start = 0
+    i = 0
+    n = len(sql)
+    while i < n:
+        ch = sql[i]
+        if sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = n if end == -1 else end + 1
+        elif sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+        elif ch in ("'", '"'):
+            end = i + 1
+            while end < n:
+                if sql[end] == ch:
+                    if sql.startswith(ch * 2, end):
+                        end += 2
+                        continue
+                    break
+                end += 1
+            i = end + 1
+        elif ch == '$':
+            tag = re.match(r'\$[A-Za-z_]*\$', sql[i:])
+            if tag:
+                end = sql.find(tag.group(0), i + len(tag.group(0)))
+                i = n if end == -1 else end + len(tag.group(0))
+            else:
+                i += 1
+        elif ch == ';':
+            statements.append(sql[start:i + 1])
+            start = i + 1
+            i += 1
+        else:
+            i += 1
+
+    rest = sql[start:]
+    if re.sub(r'--[^\n]*', '', rest).strip():
+        statements.append(rest)
+    return statements
+
+def explain_script(sql):
+    """The script with its final statement wrapped in EXPLAIN (ANALYZE, BUFFERS)."""
+    statements = split_statements(sql)
+    *setup, final = statements
+    return "".join(setup) + "\nEXPLAIN (ANALYZE, BUFFERS)\n" + final.strip() + "\n"
+
+def defines_functions(sql):
+    return re.search(r'\bCREATE\s+(OR\s+REPLACE\s+)?FUNCTION\b', sql, re.IGNORECASE) is not None
+
+# Plans of every statement, nested ones included, sent to the client as LOG
+# messages (psql prints them on stderr)
+AUTO_EXPLAIN_SETUP = """\
+LOAD 'auto_explain';
+SET auto_explain.log_min_duration = 0;
+SET auto_explain.log_analyze = on;
+SET auto_explain.log_buffers = on;
+SET auto_explain.log_nested_statements = on;
+SET client_min_messages = log;
+"""
+
+def auto_explain_script(sql):
+    """The whole script, run with auto_explain logging every statement's plan."""
+    return AUTO_EXPLAIN_SETUP + sql
+
+def run_day(day, path, dsn=None, explain_dir=None):
+    """Run one solution; returns a result dict with wall time and output rows."""
+    with open(path) as f:
+        sql = f.read()
+
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(psql_command(dsn), input=sql, capture_output=True, text=True)
+    except FileNotFoundError as e:
+        return {"day": day, "ok": False, "seconds": 0.0, "rows": [],
+                "error": f"cannot run psql: {e}"}
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "day": day,
+        "ok": proc.returncode == 0,
+        "seconds": elapsed,
+        "rows": [line.split("\t") for line in proc.stdout.splitlines() if line],
+        "error": proc.stderr.strip(),
+    }
+
+    if explain_dir and result["ok"]:
+        nested = defines_functions(sql)
+        script = auto_explain_script(sql) if nested else explain_script(sql)
+        explain = subprocess.run(psql_command(dsn), input=script, capture_output=True, text=True)
+        plan_path = os.path.join(explain_dir, f"day{day}.txt")
+        with open(plan_path, 'w') as f:
+            if explain.returncode != 0 or nested:
+                f.write(explain.stderr)
+            else:
+                f.write(explain.stdout)
+        result["plan"] = plan_path
+
+    return result
+
+def run_all(solutions, dsn=None, jobs=4, explain_dir=None, on_result=None):
+    """Run solutions over a pool of jobs concurrent sessions.
+
+    on_result(result) is called as each day finishes. Returns the results in
+    day order.
+    """
+    if explain_dir:
+        os.makedirs(explain_dir, exist_ok=True)
+
+    results = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_day, day, path, dsn, explain_dir) for day, path in solutions]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return sorted(results, key=lambda r: r["day"])
+
+def loaded_hashes(dsn=None):
+    """{day: sha256} from the database's input_manifest ({} if unreadable)."""
+    try:
+        proc = subprocess.run(psql_command(dsn), input="SELECT day, sha256 FROM input_manifest;",
+                              capture_output=True, text=True)
+    except FileNotFoundError:
+        return {}
+    loaded = {}
+    if proc.returncode == 0:
+        for line in proc.stdout.splitlines():
+            parts = line.split("\t")
+            if len(parts) == 2 and parts[0].isdigit():
+                loaded[int(parts[0])] = parts[1]
+    return loaded
+
+def cached_results(solutions, cache, loaded):
+    """Split solutions into results served from cache and ones still to run.
+
+    loaded maps day to the input hash recorded in the database. Returns
+    (results, to_run, keys), keys mapping each cacheable day to its cache
+    key; a day whose loaded input is missing or differs from day-N/input is
+    left out of keys and run without caching.
+    """
+    results, to_run, keys = [], [], {}
+    for day, path in solutions:
+        input_path = os.path.join(os.path.dirname(path), "input")
+        on_disk = generate_data_sql.input_hash(input_path) if os.path.exists(input_path) else None
+        if loaded.get(day) is None or loaded[day] != on_disk:
+            print(f"Warning: day {day} input in the database does not match {input_path}; "
+                  f"running it uncached (reload it, see generate_data_sql.py --stale)",
+                  file=sys.stderr)
+            to_run.append((day, path))
+            continue
+        keys[day] = answer_cache.sql_key(day, path, loaded[day])
+        entry = cache.get(keys[day])
+        if entry is None:
+            to_run.append((day, path))
+        else:
+            results.append({"day": day, "ok": True, "seconds": entry["seconds"],
+                            "rows": entry["value"], "error": "", "cached": True})
+    return results, to_run, keys
+
+def print_result(result):
+    status = "ok" if result["ok"] else "FAILED"
+    if result.get("cached"):
+        status += ", cached"
+    print(f"--- Day {result['day']} ({result['seconds']:.2f}s, {status}) ---")
+    for row in result["rows"]:
+        print("  " + " | ".join(row))
+    if not result["ok"]:
+        print("  " + result["error"].replace("\n", "\n  "))
+    sys.stdout.flush()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--dsn', help="Postgres connection string for psql "
+                                      "(default: the aoc_postgres docker container)")
+    parser.add_argument('--jobs', type=int, default=4, help="concurrent sessions (default 4)")
+    parser.add_argument('--days', type=int, nargs='+', help="only run these days")
+    parser.add_argument('--explain', metavar='DIR',
+                        help="save EXPLAIN (ANALYZE, BUFFERS) plans to DIR")
+    parser.add_argument('--cached', action='store_true',
+                        help="serve days with unchanged input and SQL from the answer cache")
+    parser.add_argument('--cache', default=answer_cache.DEFAULT_PATH,
+                        help="answer cache file (default %(default)s)")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    solutions = discover_solutions(script_dir, set(args.days) if args.days else None)
+
+    start = time.perf_counter()
+    served, to_run, keys = [], solutions, {}
+    if args.cached:
+        cache = answer_cache.AnswerCache(args.cache)
+        served, to_run, keys = cached_results(solutions, cache, loaded_hashes(args.dsn))
+        for result in served:
+            print_result(result)
+    ran = run_all(to_run, args.dsn, args.jobs, args.explain, on_result=print_result)
+    results = sorted(served + ran, key=lambda r: r["day"])
+    total = time.perf_counter() - start
+
+    if args.cached:
+        for result in ran:
+            if result["ok"] and result["day"] in keys:
+                cache.put(keys[result["day"]], result["rows"], result["seconds"])
+        cache.save()
+
+    print()
+    print(f"{'Day':>4}  {'Seconds':>8}  Status")
+    for result in results:
+        status = "ok" if result["ok"] else "FAILED"
+        if result.get("cached"):
+            status += " (cached)"
+        print(f"{result['day']:>4}  {result['seconds']:>8.2f}  {status}")
+    print(f"Wall time {total:.2f}s for {len(results)} days "
+          f"(sum of per-day times {sum(r['seconds'] for r in results):.2f}s)")
+
+    if not all(r["ok"] for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Registry of the Python solvers for each day, for tools that run them all.
+
+The day directories are not packages (day-N has a hyphen), so solver modules
+are loaded straight from their files. SOLVERS records, for each day and part,
+which file and function compute it and, for functions that return both parts
+as a tuple, which element is the answer.
+"""
+
+import importlib.util
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# day -> [(part, solver file, function, index into a tuple result or None)]
+SOLVERS = {
+    1: [(1, "solution.py", "solve", None),
+        (2, "solution.py", "solve_part2", None)],
+    2: [(1, "solution.py", "solve", None),
+        (2, "solution_part2.py", "solve", None)],
+    3: [(1, "solution.py", "solve", None),
+        (2, "solution_part2.py", "solve", None)],
+    4: [(1, "solution.py", "solve", None),
+        (2, "solution_part2.py", "solve", None)],
+    5: [(1, "solution.py", "solve", None),
+        (2, "solution_part2.py", "solve", None)],
+    6: [(1, "solution.py", "solve", None),
+        (2, "solution_part2.py", "solve", None)],
+    7: [(1, "solution.py", "solve", None),
+        (2, "solution_part2.py", "solve", None)],
+    8: [(1, "solution.py", "solve", None),
+        (2, "solution_part2.py", "solve", None)],
+    9: [(1, "solution.py", "solve", 0),
+        (2, "solution.py", "solve", 1)],
+    10: [(1, "solution.py", "solve", 0),
+         (2, "solution.py", "solve", 1)],
+    11: [(1, "solution.py", "solve", 0),
+         (2, "solution.py", "solve", 1)],
+    12: [(1, "solution.py", "solve", None)],
+}
+
+# solve_day options that keep each day's work in the calling process, for
+# tools that pool or profile it themselves (day 12 otherwise starts a pool and
+# prints progress).
+IN_PROCESS_OPTIONS = {
+    12: {"solve": {"workers": 1, "progress": None}},
+}
+
+def day_dir(day):
+    return os.path.join(ROOT, f"day-{day}")
+
+def input_path(day):
+    return os.path.join(day_dir(day), "input")
+
+def available_days():
+    """Days with both a registered solver and a day-N directory, in order."""
+    days = []
+    for name in os.listdir(ROOT):
+        match = re.fullmatch(r'day-(\d+)', name)
+        if match and int(match.group(1)) in SOLVERS:
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+def module_name(day, filename):
+    return f"day{day}_{os.path.splitext(filename)[0]}"
+
+def load_module(day, filename, reload=False):
+    """Import day-N/<filename> as module dayN_<stem>, caching it in sys.modules."""
+    name = module_name(day, filename)
+    if name in sys.modules and not reload:
+        return sys.modules[name]
+    path = os.path.join(day_dir(day), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+def solver_calls(day):
+    """Group a day's parts by the (file, function) that computes them.
+
+    Returns [(filename, function, [(part, index), ...])], so a function that
+    answers both parts is only called once.
+    """
+    calls = {}
+    for part, filename, function, index in SOLVERS[day]:
+        calls.setdefault((filename, function), []).append((part, index))
+    return [(filename, function, parts) for (filename, function), parts in calls.items()]
+
+def solve_day(day, path=None, options=None):
+    """Run every solver for a day on path (default day-N/input).
+
+    options maps a solver function name to extra keyword arguments for it,
+    e.g. {"solve": {"workers": 1}}. Returns {part: answer}.
+    """
+    path = path or input_path(day)
+    options = options or {}
+    answers = {}
+    for filename, function, parts in solver_calls(day):
+        result = getattr(load_module(day, filename), function)(path, **options.get(function, {}))
+        for part, index in parts:
+            answers[part] = result if index is None else result[index]
+    return answers
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic inputs for every day, at any scale.
+
+Each generator takes a random.Random and a size n (what n counts is listed in
+SCALE) and returns the input text. Generated inputs keep the structural
+invariants the solvers rely on, e.g. day 9 polygons are simple and
+rectilinear, day 10 machines are solvable, day 11 graphs are acyclic with path
+counts that fit in BIGINT.
+
+Usage:
+    python3 synthetic.py 8 --n 5000 --seed 1 -o /tmp/day8-5000
+"""
+
+import argparse
+import random
+import string
+import sys
+
+def day1(rng, n):
+    return "".join(f"{rng.choice('LR')}{rng.randint(1, 999)}\n" for _ in range(n))
+
+def day2(rng, n, max_digits=10):
+    """n disjoint ID ranges on one comma-separated line."""
+    # Pick 2n distinct boundaries so ranges never overlap
+    bounds = sorted(rng.sample(range(1, 10 ** max_digits), 2 * n))
+    ranges = []
+    for i in range(n):
+        start, end = bounds[2 * i], bounds[2 * i + 1]
+        # Keep each range narrow, like the puzzle input
+        end = min(end, start + rng.randint(10, 10 ** (len(str(start)) // 2 + 2)))
+        ranges.append(f"{start}-{end}")
+    rng.shuffle(ranges)
+    return ",".join(ranges) + "\n"
+
+def day3(rng, n, length=100):
+    return "".join("".join(rng.choice("123456789") for _ in range(length)) + "\n"
+                   for _ in range(n))
+
+def day4(rng, n, density=0.7):
+    """An n x n grid of paper rolls."""
+    return "".join("".join('@' if rng.random() < density else '.' for _ in range(n)) + "\n"
+                   for _ in range(n))
+
+def day5(rng, n, ids=1000, max_value=10 ** 15):
+    """n (possibly overlapping) fresh ranges, a blank line, then ids IDs."""
+    lines = []
+    for _ in range(n):
+        start = rng.randint(1, max_value)
+        lines.append(f"{start}-{start + rng.randint(0, max_value // 200)}")
+    lines.append("")
+    lines.extend(str(rng.randint(1, max_value)) for _ in range(ids))
+    return "\n".join(lines) + "\n"
+
+def day6(rng, n, rows=4, max_digits=4):
+    """n problems side by side, rows numbers each, operator row at the bottom.
+
+    Within a problem every column holds at least one digit (the widest number
+    spans the whole block), so only the separators are all-space columns.
+    """
+    grid = [[] for _ in range(rows + 1)]
+    for p in range(n):
+        width = rng.randint(1, max_digits)
+        numbers = [str(rng.randint(10 ** (width - 1), 10 ** width - 1))]
+        numbers += [str(rng.randint(1, 10 ** rng.randint(1, width) - 1)) for _ in range(rows - 1)]
+        rng.shuffle(numbers)
+        for r, number in enumerate(numbers):
+            cell = number.ljust(width) if rng.random() < 0.5 else number.rjust(width)
+            grid[r].append(cell)
+        grid[rows].append(rng.choice('*+').ljust(width))
+    return "".join(" ".join(row) + "\n" for row in grid)
+
+def day7(rng, n, density=0.3):
+    """An n-wide, n-tall manifold: S on top, splitters on every other row.
+
+    Splitters are never adjacent or on the edge, so split beams stay apart.
+    """
+    width = n
+    rows = [['.'] * width for _ in range(n)]
+    rows[0][width // 2] = 'S'
+    for r in range(2, n, 2):
+        c = 1
+        while c < width - 1:
+            if rng.random() < density:
+                rows[r][c] = '^'
+                c += 2
+            else:
+                c += 1
+    return "".join("".join(row) + "\n" for row in rows)
+
+def day8(rng, n, extent=100000):
+    """n distinct 3D points.
+
+    Part 1 multiplies the three largest circuits after the 1000 closest
+    connections, so three far-away outliers guarantee at least three circuits
+    (their edges are the longest, so they are connected last).
+    """
+    if n < 50:
+        raise ValueError("day 8 needs n >= 50 (1000 connections, three circuits)")
+    points = set()
+    while len(points) < n - 3:
+        points.add((rng.randrange(extent), rng.randrange(extent), rng.randrange(extent)))
+    points = list(points)
+    far = 10 * extent
+    points += [(far, 0, 0), (0, far, 0), (0, 0, far)]
+    rng.shuffle(points)
+    return "".join(f"{x},{y},{z}\n" for x, y, z in points)
+
+def day9(rng, n, extent=100000):
+    """A simple rectilinear polygon with about n vertices (rounded to 4k).
+
+    Built from k columns, each spanning [bottom, top), with neighbouring
+    columns overlapping vertically and all heights distinct between
+    neighbours, walked as a lower and an upper staircase.
+    """
+    k = max(1, n // 4)
+    xs = sorted(rng.sample(range(extent), k + 1))
+    mid = extent // 2
+    bottoms, tops = [], []
+    for i in range(k):
+        while True:
+            bottom = rng.randint(0, mid - 1)
+            top = rng.randint(mid + 1, extent)
+            if not bottoms or (bottom != bottoms[-1] and top != tops[-1]):
+                break
+        bottoms.append(bottom)
+        tops.append(top)
+
+    vertices = []
+    for i in range(k):  # lower staircase, left to right
+        vertices.append((xs[i], bottoms[i]))
+        vertices.append((xs[i + 1], bottoms[i]))
+    for i in reversed(range(k)):  # upper staircase, right to left
+        vertices.append((xs[i + 1], tops[i]))
+        vertices.append((xs[i], tops[i]))
+
+    return "".join(f"{x},{y}\n" for x, y in vertices)
+
+def day10(rng, n, max_lights=8, max_press=12):
+    """n machines, each solvable for both parts.
+
+    The light target is the XOR of a random set of buttons and the joltage
+    targets are the counter totals of a random non-negative press vector.
+    """
+    lines = []
+    for _ in range(n):
+        lights = rng.randint(4, max_lights)
+        n_buttons = rng.randint(lights - 2, lights + 2)
+        buttons = [sorted(rng.sample(range(lights), rng.randint(1, lights - 1)))
+                   for _ in range(n_buttons)]
+        # Every counter is touched by some button
+        for counter in range(lights):
+            if not any(counter in b for b in buttons):
+                rng.choice(buttons).append(counter)
+        buttons = [sorted(set(b)) for b in buttons]
+
+        target = [False] * lights
+        for b in buttons:
+            if rng.random() < 0.5:
+                for c in b:
+                    target[c] = not target[c]
+        presses = [rng.randint(0, max_press) for _ in buttons]
+        joltage = [sum(p for p, b in zip(presses, buttons) if c in b) for c in range(lights)]
+
+        pattern = "".join('#' if t else '.' for t in target)
+        button_text = " ".join("(" + ",".join(map(str, b)) + ")" for b in buttons)
+        lines.append(f"[{pattern}] {button_text} {{{','.join(map(str, joltage))}}}")
+    return "\n".join(lines) + "\n"
+
+def _node_names(rng, count, reserved):
+    """count distinct lowercase names, avoiding reserved ones."""
+    length = 3
+    while 26 ** length < 2 * (count + len(reserved)):
+        length += 1
+    names = set()
+    while len(names) < count:
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+        if name not in reserved:
+            names.add(name)
+    return sorted(names)
+
+def day11(rng, n, max_out=4, window=40, max_paths=2 ** 20):
+    """A DAG of n nodes including you, svr, dac, fft and out.
+
+    Edges only point forward in a random topological order, so there are no
+    cycles, and every node but out has an edge, so every path ends at out.
+    One svr -> dac/fft -> fft/dac -> out chain is always kept so part 2 is
+    non-zero. Path counts to out are capped at max_paths per node by pruning
+    other edges in reverse order; since each part 2 term multiplies three
+    such counts, the answers stay within BIGINT.
+    """
+    special = ['svr', 'you', 'dac', 'fft', 'out']
+    order = _node_names(rng, max(n - len(special), 0), set(special))
+    rng.shuffle(order)
+    # svr first, out last, dac and fft somewhere in between
+    order.insert(0, 'svr')
+    for name in ('you', 'dac', 'fft'):
+        order.insert(rng.randint(1, len(order)), name)
+    order.append('out')
+    index = {name: i for i, name in enumerate(order)}
+
+    edges = {}
+    for i, name in enumerate(order[:-1]):
+        later = order[i + 1:i + 1 + window]
+        edges[name] = rng.sample(later, min(len(later), rng.randint(1, max_out)))
+
+    # Walk forward in window-sized hops through the waypoints
+    kept = {}
+    waypoints = sorted(['svr', 'dac', 'fft', 'out'], key=index.get)
+    for src, dst in zip(waypoints, waypoints[1:]):
+        i = index[src]
+        while i != index[dst]:
+            j = index[dst] if index[dst] - i <= window else i + rng.randint(1, window)
+            kept[order[i]] = order[j]
+            if order[j] not in edges[order[i]]:
+                edges[order[i]].append(order[j])
+            i = j
+
+    paths = {'out': 1}
+    for name in reversed(order[:-1]):
+        dsts = sorted(edges[name], key=lambda d: (d == kept.get(name), -paths[d]))
+        while len(dsts) > 1 and sum(paths[d] for d in dsts) > max_paths:
+            dsts.pop(0)
+        edges[name] = sorted(dsts, key=index.get)
+        paths[name] = sum(paths[d] for d in dsts)
+
+    lines = [f"{name}: {' '.join(dsts)}" for name, dsts in edges.items()]
+    rng.shuffle(lines)
+    return "\n".join(lines) + "\n"
+
+def _polyomino(rng, cells):
+    """A random connected set of cells inside a 3x3 box touching rows/cols 0."""
+    while True:
+        shape = {(rng.randrange(3), rng.randrange(3))}
+        while len(shape) < cells:
+            r, c = rng.choice(sorted(shape))
+            dr, dc = rng.choice([(0, 1), (1, 0), (0, -1), (-1, 0)])
+            if 0 <= r + dr < 3 and 0 <= c + dc < 3:
+                shape.add((r + dr, c + dc))
+        if {r for r, _ in shape} == {0, 1, 2} and {c for _, c in shape} == {0, 1, 2}:
+            return shape
+
+def day12(rng, n, shapes=6, max_side=50):
+    """Six 3x3 present shapes and n regions.
+
+    Like the puzzle input, regions either clearly fit (at most one piece per
+    3x3 block) or clearly cannot (more cells than area), in equal measure.
+    """
+    shape_cells = [_polyomino(rng, rng.randint(5, 7)) for _ in range(shapes)]
+    sizes = [len(s) for s in shape_cells]
+
+    lines = []
+    for idx, shape in enumerate(shape_cells):
+        lines.append(f"{idx}:")
+        for r in range(3):
+            lines.append("".join('#' if (r, c) in shape else '.' for c in range(3)))
+        lines.append("")
+
+    for _ in range(n):
+        width = rng.randint(12, max_side)
+        height = rng.randint(12, max_side)
+        counts = [0] * shapes
+        if rng.random() < 0.5:
+            for _ in range((width // 3) * (height // 3)):
+                counts[rng.randrange(shapes)] += 1
+        else:
+            while sum(c * s for c, s in zip(counts, sizes)) <= width * height:
+                counts[rng.randrange(shapes)] += 1
+        lines.append(f"{width}x{height}: {' '.join(map(str, counts))}")
+    return "\n".join(lines) + "\n"
+
+GENERATORS = {
+    1: day1, 2: day2, 3: day3, 4: day4, 5: day5, 6: day6,
+    7: day7, 8: day8, 9: day9, 10: day10, 11: day11, 12: day12,
+}
+
+# What n means for each day, and the size of the puzzle input
+SCALE = {
+    1: ("rotations", 4256),
+    2: ("ID ranges", 33),
+    3: ("battery banks", 200),
+    4: ("grid side", 139),
+    5: ("fresh ranges", 174),
+    6: ("problems", 1000),
+    7: ("grid side", 142),
+    8: ("junction boxes", 1000),
+    9: ("polygon vertices", 496),
+    10: ("machines", 197),
+    11: ("graph nodes", 592),
+    12: ("regions", 1000),
+}
+
+def generate(day, n=None, seed=0, **params):
+    """Input text for day at size n (default: the puzzle input's size)."""
+    if n is None:
+        n = SCALE[day][1]
+    return GENERATORS[day](random.Random(seed), n, **params)
+
+def write_input(path, day, n=None, seed=0, **params):
+    with open(path, 'w') as f:
+        f.write(generate(day, n, seed, **params))
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('day', type=int, choices=sorted(GENERATORS))
+    parser.add_argument('--n', type=int, help="size (see SCALE; default: puzzle input size)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    text = generate(args.day, args.n, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+if __name__ == "__main__":
+    main()
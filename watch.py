@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Keep the solvers warm and re-solve a day whenever its input or code changes.
+
+Loads every solver module once and solves each day, then polls
+day-N/input and day-N/solution*.py. When a solver file changes only that
+module is reloaded; when an input changes the warm modules are reused (and
+the parse cache serves unchanged inputs). Either way only the affected day is
+solved again, with its timing printed. Errors are printed and the watch
+carries on, so a half-finished edit does not end the session.
+
+Usage:
+    python3 watch.py                  # every day
+    python3 watch.py --days 8 9 --interval 0.2
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+
+import solvers
+
+def watched_files(day):
+    return [solvers.input_path(day)] + sorted(glob.glob(os.path.join(solvers.day_dir(day),
+                                                                     "solution*.py")))
+
+def snapshot(days):
+    """{path: (mtime_ns, size)} for every watched file that exists."""
+    state = {}
+    for day in days:
+        for path in watched_files(day):
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+def changed_days(before, after):
+    """{day: [changed paths]} between two snapshots (edits, adds, removals)."""
+    changes = {}
+    for path in set(before) | set(after):
+        if before.get(path) != after.get(path):
+            day = int(os.path.basename(os.path.dirname(path)).split('-')[1])
+            changes.setdefault(day, []).append(path)
+    return changes
+
+def reload_changed(day, paths):
+    """Reload the registered solver modules among paths."""
+    registered = {filename for _, filename, _, _ in solvers.SOLVERS[day]}
+    for path in paths:
+        filename = os.path.basename(path)
+        if filename in registered and os.path.exists(path):
+            solvers.load_module(day, filename, reload=True)
+
+def solve_and_report(day, reason):
+    stamp = time.strftime("%H:%M:%S")
+    start = time.perf_counter()
+    try:
+        answers = solvers.solve_day(day)
+    except Exception:
+        print(f"[{stamp}] Day {day} ({reason}) FAILED after "
+              f"{time.perf_counter() - start:.2f}s")
+        traceback.print_exc()
+        return
+    elapsed = time.perf_counter() - start
+    parts = "  ".join(f"Part {part}: {answer}" for part, answer in sorted(answers.items()))
+    print(f"[{stamp}] Day {day} ({reason}) {elapsed:.3f}s  {parts}")
+    sys.stdout.flush()
+
+def watch(days, interval=0.5):
+    for day in days:
+        try:
+            for filename, _, _ in solvers.solver_calls(day):
+                solvers.load_module(day, filename)
+        except Exception:
+            traceback.print_exc()
+        solve_and_report(day, "start")
+
+    state = snapshot(days)
+    print(f"Watching {len(state)} files; Ctrl-C to stop.")
+    sys.stdout.flush()
+    while True:
+        time.sleep(interval)
+        current = snapshot(days)
+        for day, paths in sorted(changed_days(state, current).items()):
+            reason = ", ".join(sorted(os.path.basename(p) for p in paths)) + " changed"
+            try:
+                reload_changed(day, paths)
+            except Exception:
+                print(f"[{time.strftime('%H:%M:%S')}] Day {day} ({reason}) reload FAILED")
+                traceback.print_exc()
+                continue
+            solve_and_report(day, reason)
+        state = current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--days', type=int, nargs='+', help="only watch these days")
+    parser.add_argument('--interval', type=float, default=0.5,
+                        help="polling interval in seconds (default 0.5)")
+    args = parser.parse_args()
+
+    try:
+        watch(args.days or solvers.available_days(), args.interval)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()